@@ -3,17 +3,6 @@ import { useCallback, useRef } from "react";
 import { BACKEND_WS_URL } from "./sttUtils";
 import { createBackendMessageHandler } from "./audioMessages";
 
-const arrayBufferToBase64 = (buffer) => {
-  const bytes = new Uint8Array(buffer);
-  let binary = "";
-  const chunkSize = 0x8000;
-  for (let i = 0; i < bytes.length; i += chunkSize) {
-    const slice = bytes.subarray(i, i + chunkSize);
-    binary += String.fromCharCode(...slice);
-  }
-  return btoa(binary);
-};
-
 /**
  * Manages the backend transcript WebSocket and sends audio chunks to backend-owned STT.
  */
@@ -60,14 +49,8 @@ export default function useTranscriptSockets({
     ) {
       return;
     }
-    backendWsRef.current.send(
-      JSON.stringify({
-        type: "audio_chunk",
-        audio_base64: arrayBufferToBase64(buffer),
-        encoding: "pcm_s16le",
-        sample_rate_hz: 16000,
-      })
-    );
+    // Raw pcm_s16le @ 16 kHz; the backend treats every binary frame as audio.
+    backendWsRef.current.send(buffer);
   }, []);
 
   const connectBackendSocket = useCallback(
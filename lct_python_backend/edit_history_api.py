@@ -1,13 +1,17 @@
 """Edit history & training data export API endpoints (Week 10)."""
 import logging
+import uuid
+from contextlib import AsyncExitStack
+from datetime import datetime
 from typing import Optional, List
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 
 from lct_python_backend.db import db
 from lct_python_backend.services.edit_logger import EditLogger
-from lct_python_backend.services.training_data_export import TrainingDataExporter
+from lct_python_backend.services.training_data_export import EXPORT_MEDIA_TYPES, TrainingDataExporter
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["edit-history"])
@@ -176,7 +180,10 @@ async def get_edit_statistics(conversation_id: str):
 async def export_training_data(
     conversation_id: str,
     format: str = "jsonl",
-    unexported_only: bool = False
+    unexported_only: bool = False,
+    since: Optional[datetime] = Query(None, description="Only export edits created after this time"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of edits to export"),
+    include_node_context: bool = Query(True, description="Prefix JSONL node edits with node context")
 ):
     """
     Export training data for a conversation
@@ -185,47 +192,71 @@ async def export_training_data(
         conversation_id: UUID of conversation
         format: Export format ('jsonl', 'csv', 'markdown')
         unexported_only: Only export unexported edits
+        since: Only export edits created after this time (incremental export)
+        limit: Maximum number of edits to export
+        include_node_context: Prefix JSONL node edits with node context
+            (skips the node lookup when False)
 
     Returns:
-        Exported data as text/plain
+        Exported data streamed with the format's media type
     """
-    try:
-        async with db.session() as session:
-            exporter = TrainingDataExporter(session)
-            data = await exporter.export_conversation_edits(
-                conversation_id,
-                format=format,
-                unexported_only=unexported_only
-            )
-
-            # Determine content type
-            content_type = {
-                "jsonl": "application/x-ndjson",
-                "csv": "text/csv",
-                "markdown": "text/markdown"
-            }.get(format, "text/plain")
-
-            # Determine filename
-            dataset_id = await exporter.generate_dataset_id(conversation_id)
-            extension = format
-            filename = f"{dataset_id}.{extension}"
-
-            return Response(
-                content=data,
-                media_type=content_type,
-                headers={
-                    "Content-Disposition": f"attachment; filename={filename}"
-                }
-            )
+    content_type = EXPORT_MEDIA_TYPES.get(format)
+    if content_type is None:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
 
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        conv_uuid = uuid.UUID(conversation_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid conversation ID")
+
+    # Determine filename
+    dataset_id = await TrainingDataExporter.generate_dataset_id(conversation_id)
+    filename = f"{dataset_id}.{format}"
+
+    # Run the export's queries (and read its first chunk) before responding:
+    # once StreamingResponse has sent the 200 headers, a failure can only
+    # truncate the body
+    session_scope = AsyncExitStack()
+    try:
+        session = await session_scope.enter_async_context(db.session())
+        chunks = TrainingDataExporter(session).stream_conversation_edits(
+            conv_uuid,
+            format=format,
+            unexported_only=unexported_only,
+            since=since,
+            limit=limit,
+            include_node_context=include_node_context
+        )
+        first_chunk = await anext(chunks, None)
     except Exception as e:
+        await session_scope.aclose()
         print(f"[ERROR] Failed to export training data: {e}")
-        import traceback
-        traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def stream_export():
+        # The session must stay open while the response body is streamed
+        async with session_scope:
+            try:
+                if first_chunk is not None:
+                    yield first_chunk
+                async for chunk in chunks:
+                    yield chunk
+            except Exception as e:
+                print(f"[ERROR] Failed to export training data: {e}")
+                import traceback
+                traceback.print_exc()
+                raise
+
+    return StreamingResponse(
+        stream_export(),
+        media_type=content_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}"
+        },
+        # Closes the session if the body is never streamed (no-op otherwise)
+        background=BackgroundTask(session_scope.aclose)
+    )
+
 
 @router.post("/api/edits/{edit_id}/feedback")
 async def add_edit_feedback(edit_id: str, feedback: dict):
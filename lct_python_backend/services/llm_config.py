@@ -22,6 +22,8 @@ def get_env_llm_defaults() -> Dict[str, Any]:
         "chat_model": os.getenv("LOCAL_LLM_CHAT_MODEL", "glm-4.6v-flash"),
         "embedding_model": os.getenv("LOCAL_LLM_EMBEDDING_MODEL", "text-embedding-qwen3-embedding-8b"),
         "json_mode": _to_bool(os.getenv("LOCAL_LLM_JSON_MODE", "true")),
+        # llama.cpp-style servers reuse the KV cache of the shared system prompt.
+        "cache_prompt": _to_bool(os.getenv("LOCAL_LLM_CACHE_PROMPT", "false")),
         "timeout_seconds": float(os.getenv("LOCAL_LLM_TIMEOUT_SECONDS", "120")),
     }
 
@@ -33,7 +35,7 @@ def merge_llm_config(overrides: Optional[Dict[str, Any]]) -> Dict[str, Any]:
 
     sanitized = {}
     for key, value in overrides.items():
-        if key in {"json_mode"}:
+        if key in {"json_mode", "cache_prompt"}:
             sanitized[key] = _to_bool(value)
         elif key == "mode":
             normalized = str(value).strip().lower()
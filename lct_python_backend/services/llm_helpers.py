@@ -6,7 +6,7 @@ import anthropic
 from typing import Dict, Generator, List
 
 from lct_python_backend.config import ANTHROPIC_API_KEY
-from lct_python_backend.services.transcript_processing import generate_lct_json
+from lct_python_backend.services.transcript_processing import extend_json_array_text, generate_lct_json
 
 
 def claude_llm_call(transcript: str, claude_prompt: str, start_text: str, temp: float = 0.6, retries: int = 5, backoff_base: float = 1.5):
@@ -424,22 +424,23 @@ def stream_generate_context_json(chunks: Dict[str, str]) -> Generator[str, None,
     if not isinstance(chunks, dict):
         raise TypeError("The chunks must be a dictionary.")
 
-    existing_json = []
+    # Compact JSON of every node so far, extended per chunk instead of re-serialized.
+    existing_json_text = "[]"
 
     for chunk_id, chunk_text in chunks.items():
-        mod_input = f'Existing JSON : \n {repr(existing_json)} \n\n Transcript Input: \n {chunk_text}'
+        mod_input = f'Existing JSON : \n {existing_json_text} \n\n Transcript Input: \n {chunk_text}'
         output_json = generate_lct_json(mod_input)
         # output_json = generate_lct_json_claude(mod_input)
 
         if output_json is None:
-            yield json.dumps(existing_json)  # Send whatever we have so far
+            yield existing_json_text  # Send whatever we have so far
             continue
 
         for item in output_json:
             item["chunk_id"] = chunk_id  # Attach chunk ID
 
-        existing_json.extend(output_json)
-        yield json.dumps(existing_json)
+        existing_json_text = extend_json_array_text(existing_json_text, output_json)
+        yield existing_json_text
         time.sleep(0.5)
 
 
@@ -5,6 +5,7 @@ import re
 from typing import Any, Dict, Optional, Tuple
 
 import httpx
+import orjson
 
 from lct_python_backend.services.llm_config import get_env_llm_defaults
 
@@ -27,13 +28,19 @@ def extract_json_from_text(text: str) -> Any:
     if text is None:
         raise ValueError("LLM response text is empty")
 
+    # Fast path: with JSON mode on, most responses are already valid JSON.
+    try:
+        return orjson.loads(text)
+    except json.JSONDecodeError:
+        pass
+
     # Strip chain-of-thought style wrappers commonly emitted by local models.
     normalized = re.sub(r"<think>.*?</think>", "", str(text), flags=re.IGNORECASE | re.DOTALL).strip()
     if not normalized:
         raise json.JSONDecodeError("No JSON object found", str(text), 0)
 
     try:
-        return json.loads(normalized)
+        return orjson.loads(normalized)
     except json.JSONDecodeError:
         pass
 
@@ -44,7 +51,7 @@ def extract_json_from_text(text: str) -> Any:
                 if "```" in snippet:
                     candidate = snippet.split("```", 1)[0].strip()
                     try:
-                        return json.loads(candidate)
+                        return orjson.loads(candidate)
                     except json.JSONDecodeError:
                         continue
 
@@ -13,6 +13,12 @@ from typing import Any, Dict, Optional
 import httpx
 import numpy as np
 
+try:
+    # SIMD base64 with the same b64decode signature as the stdlib module.
+    import pybase64 as _base64
+except ImportError:
+    _base64 = base64
+
 logger = logging.getLogger("lct_backend")
 
 DEFAULT_SAMPLE_RATE_HZ = int(os.getenv("STT_SAMPLE_RATE_HZ", "16000"))
@@ -84,7 +90,7 @@ def decode_audio_base64(audio_base64: Any) -> bytes:
     if not isinstance(audio_base64, str) or not audio_base64.strip():
         return b""
     try:
-        return base64.b64decode(audio_base64)
+        return _base64.b64decode(audio_base64, validate=False)
     except Exception as exc:  # noqa: BLE001
         raise ValueError("Invalid base64-encoded audio chunk.") from exc
 
@@ -1,8 +1,10 @@
 """STT settings persistence service."""
 
+import copy
 import logging
+import time
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 from sqlalchemy import select
 
@@ -11,15 +13,36 @@ from lct_python_backend.services.stt_config import STT_CONFIG_KEY, merge_stt_con
 
 logger = logging.getLogger(__name__)
 
+STT_SETTINGS_CACHE_TTL_SECONDS = 60.0
+
+# (monotonic expiry, merged settings); every WS session_meta reads settings,
+# so reconnect bursts would otherwise cost one DB round-trip each.
+_settings_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
+def invalidate_stt_settings_cache() -> None:
+    global _settings_cache
+    _settings_cache = None
+
 
 async def load_stt_settings(session) -> Dict[str, Any]:
-    """Load merged STT settings from DB overrides + env defaults."""
+    """Load merged STT settings from DB overrides + env defaults.
+
+    Results are cached process-wide for ``STT_SETTINGS_CACHE_TTL_SECONDS``;
+    ``save_stt_settings`` drops the cache.
+    """
+    global _settings_cache
+    if _settings_cache is not None and time.monotonic() < _settings_cache[0]:
+        return copy.deepcopy(_settings_cache[1])
+
     setting = await session.execute(
         select(AppSetting).where(AppSetting.key == STT_CONFIG_KEY)
     )
     value = setting.scalar_one_or_none()
     overrides = value.value if value else {}
-    return merge_stt_config(overrides)
+    merged = merge_stt_config(overrides)
+    _settings_cache = (time.monotonic() + STT_SETTINGS_CACHE_TTL_SECONDS, merged)
+    return copy.deepcopy(merged)
 
 
 async def save_stt_settings(session, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -35,4 +58,5 @@ async def save_stt_settings(session, payload: Dict[str, Any]) -> Dict[str, Any]:
     else:
         session.add(AppSetting(key=STT_CONFIG_KEY, value=payload))
     await session.commit()
+    invalidate_stt_settings_cache()
     return merge_stt_config(payload)
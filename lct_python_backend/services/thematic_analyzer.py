@@ -10,10 +10,11 @@ Uses OpenRouter API to analyze conversations and create high-level thematic stru
 """
 
 import json
+import logging
 import uuid
 import httpx
 import os
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
@@ -21,6 +22,53 @@ from lct_python_backend.models import Utterance, Node, Relationship
 from lct_python_backend.services.llm_config import load_llm_config
 from lct_python_backend.services.local_llm_client import local_chat_json
 
+logger = logging.getLogger(__name__)
+
+OPENROUTER_CHAT_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+THEMATIC_SYSTEM_PROMPT = (
+    "You are an expert conversation analyst. You analyze conversations and identify "
+    "high-level thematic structure, relationships between ideas, and the flow of topics. "
+    "You must respond with valid JSON only."
+)
+
+# JSON schema for structured response (using sequence numbers instead of UUIDs)
+THEMATIC_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "thematic_nodes": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "label": {"type": "string"},
+                    "summary": {"type": "string"},
+                    "utterance_sequence_numbers": {
+                        "type": "array",
+                        "items": {"type": "integer", "minimum": 0}
+                    },
+                    "node_type": {"type": "string"}
+                },
+                "required": ["label", "summary", "utterance_sequence_numbers", "node_type"]
+            }
+        },
+        "edges": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "source_label": {"type": "string"},
+                    "target_label": {"type": "string"},
+                    "relationship_type": {"type": "string"},
+                    "description": {"type": "string"}
+                },
+                "required": ["source_label", "target_label", "relationship_type"]
+            }
+        }
+    },
+    "required": ["thematic_nodes", "edges"]
+}
+
 
 class ThematicAnalyzer:
     """Generates thematic structure from conversation utterances"""
@@ -30,6 +78,28 @@ class ThematicAnalyzer:
         self.model = model
         self.api_key = os.getenv("OPENROUTER_API_KEY")
 
+        # The model is fixed for this analyzer's lifetime, so the request skeleton
+        # (system prompt + strict schema) and headers are built once here.
+        self._request_template = {
+            "model": self.model,
+            "messages": [{"role": "system", "content": THEMATIC_SYSTEM_PROMPT}],
+            "temperature": 0.3,
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "thematic_analysis",
+                    "strict": True,
+                    "schema": THEMATIC_JSON_SCHEMA
+                }
+            },
+        }
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://live-conversational-threads.app",
+            "X-Title": "Live Conversational Threads"
+        }
+
     async def analyze_conversation(
         self,
         conversation_id: str,
@@ -53,19 +123,14 @@ class ThematicAnalyzer:
         """
         # Check if thematic analysis already exists
         if not force_reanalysis:
-            existing_result = await self.db.execute(
-                select(Node).where(
-                    and_(
-                        Node.conversation_id == uuid.UUID(conversation_id),
-                        Node.level == 2  # Level 2 = thematic/coarse-grained
-                    )
-                )
+            # Level 2 = thematic/coarse-grained
+            existing_nodes, existing_relationships = await self._fetch_existing_structure(
+                conversation_id, level=2
             )
-            existing_nodes = existing_result.scalars().all()
 
             if existing_nodes:
                 # Return existing thematic structure
-                return await self._serialize_existing_structure(existing_nodes, conversation_id)
+                return self._serialize_existing_structure(existing_nodes, existing_relationships)
 
         # Fetch all utterances for the conversation
         utterances_result = await self.db.execute(
@@ -116,45 +181,6 @@ class ThematicAnalyzer:
         # Construct prompt
         prompt = self._build_thematic_analysis_prompt(utterance_data, max_themes)
 
-        # Define JSON schema for structured response (using sequence numbers instead of UUIDs)
-        json_schema = {
-            "type": "object",
-            "properties": {
-                "thematic_nodes": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "label": {"type": "string"},
-                            "summary": {"type": "string"},
-                            "utterance_sequence_numbers": {
-                                "type": "array",
-                                "items": {"type": "integer", "minimum": 0}
-                            },
-                            "node_type": {"type": "string"},
-                            "timestamp_start": {"type": "number"},
-                            "timestamp_end": {"type": "number"}
-                        },
-                        "required": ["label", "summary", "utterance_sequence_numbers", "node_type"]
-                    }
-                },
-                "edges": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "source_label": {"type": "string"},
-                            "target_label": {"type": "string"},
-                            "relationship_type": {"type": "string"},
-                            "description": {"type": "string"}
-                        },
-                        "required": ["source_label", "target_label", "relationship_type"]
-                    }
-                }
-            },
-            "required": ["thematic_nodes", "edges"]
-        }
-
         config = await load_llm_config(self.db)
         if config.get("mode") == "local":
             messages = [
@@ -174,42 +200,24 @@ class ThematicAnalyzer:
         if not self.api_key:
             raise ValueError("OPENROUTER_API_KEY not found in environment variables")
 
-        # Try with strict schema first (for models that support it)
-        request_body = {
-            "model": self.model,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "You are an expert conversation analyst. You analyze conversations and identify high-level thematic structure, relationships between ideas, and the flow of topics. You must respond with valid JSON only."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": 0.3,
-        }
+        # Start from the prebuilt template and only inject the user prompt
+        request_body = dict(self._request_template)
+        request_body["messages"] = [
+            *self._request_template["messages"],
+            {"role": "user", "content": prompt},
+        ]
+        # Cap output length: generation dominates latency, and one short
+        # summary per theme plus a few edges fits comfortably in this budget.
+        # Never go below the 3000 used before, so small max_themes values
+        # can't truncate the JSON (edges are not counted per theme).
+        request_body["max_tokens"] = max(3000, min(8192, max_themes * 220 + 500))
 
         # Try to use schema if model supports it, otherwise fall back to json_object
         try:
-            request_body["response_format"] = {
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "thematic_analysis",
-                    "strict": True,
-                    "schema": json_schema
-                }
-            }
-
             async with httpx.AsyncClient(timeout=120.0) as client:
                 response = await client.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                        "HTTP-Referer": "https://live-conversational-threads.app",
-                        "X-Title": "Live Conversational Threads"
-                    },
+                    OPENROUTER_CHAT_URL,
+                    headers=self._headers,
                     json=request_body
                 )
         except Exception as e:
@@ -219,13 +227,8 @@ class ThematicAnalyzer:
 
             async with httpx.AsyncClient(timeout=120.0) as client:
                 response = await client.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                        "HTTP-Referer": "https://live-conversational-threads.app",
-                        "X-Title": "Live Conversational Threads"
-                    },
+                    OPENROUTER_CHAT_URL,
+                    headers=self._headers,
                     json=request_body
                 )
 
@@ -264,10 +267,10 @@ class ThematicAnalyzer:
         """
         Build the prompt for thematic analysis
         """
-        utterances_text = "\n".join([
+        utterances_text = "\n".join(
             f"[{u['sequence']}] {u['speaker']}: {u['text']} (timestamp: {u['timestamp_start']:.1f}s)"
             for u in utterances
-        ])
+        )
 
         prompt = f"""Analyze this conversation and generate a high-level thematic structure.
 
@@ -287,10 +290,11 @@ Choose the number of themes that best represents the conversation's natural stru
 
 For each thematic node, identify:
 1. A concise label (2-5 words)
-2. A brief summary (1-2 sentences)
+2. A single concise summary sentence (15 words or fewer)
 3. The utterance sequence numbers it encompasses (e.g., [5, 6, 7, 12, 15])
 4. The node type (e.g., discussion, claim, worldview, normative, question, resolution, debate, consensus, tangent, etc.)
-5. Timestamp range (start and end)
+
+Do NOT output timestamps for themes - they are derived from the cited utterances.
 
 Also identify the relationships (edges) between thematic nodes. Create a RICH graph structure - each node should typically have 2-4 edges (either incoming or outgoing or both). Look for:
 - TEMPORAL FLOW: How topics lead to each other chronologically (builds_on, leads_to)
@@ -317,25 +321,19 @@ Return a JSON object with this EXACT structure:
       "label": "Project Timeline Discussion",
       "summary": "Team discusses Q1 deadlines and resource allocation constraints",
       "utterance_sequence_numbers": [5, 6, 7, 12, 15, 16],
-      "node_type": "discussion",
-      "timestamp_start": 145.3,
-      "timestamp_end": 312.8
+      "node_type": "discussion"
     }},
     {{
       "label": "Budget Constraints",
       "summary": "Financial limitations and cost-cutting measures explored",
       "utterance_sequence_numbers": [17, 18, 19, 22],
-      "node_type": "discussion",
-      "timestamp_start": 315.2,
-      "timestamp_end": 445.8
+      "node_type": "discussion"
     }},
     {{
       "label": "Resource Allocation",
       "summary": "Debate over team assignments and workload distribution",
       "utterance_sequence_numbers": [20, 21, 25, 26],
-      "node_type": "debate",
-      "timestamp_start": 450.0,
-      "timestamp_end": 620.5
+      "node_type": "debate"
     }}
   ],
   "edges": [
@@ -369,8 +367,8 @@ EDGE EXAMPLES - Each node can have MULTIPLE outgoing and incoming edges:
 IMPORTANT:
 - Use utterance sequence numbers (simple integers) - NOT UUIDs
 - Sequence numbers are much easier to work with than complex UUID strings
-- Ensure timestamps are accurate (in seconds)
 - Choose the number of themes that best fits the conversation complexity
+- Edge "description" is optional; omit it when the relationship_type says enough
 - Every edge must reference labels that exist in thematic_nodes
 - Use descriptive node types and relationship types that make sense for this specific conversation
 """
@@ -391,8 +389,14 @@ IMPORTANT:
         created_nodes = []
         label_to_node_id = {}  # Map labels to created node IDs
 
-        # Create mapping: sequence_number -> UUID (for remapping LLM response)
-        seq_to_uuid = {utt.sequence_number: utt.id for utt in utterances}
+        # Create mappings: sequence_number -> UUID (for remapping LLM response)
+        # and sequence_number -> (start, end) so theme time ranges are computed
+        # from the cited utterances instead of trusting LLM-emitted values
+        seq_to_uuid = {}
+        seq_to_times = {}
+        for utt in utterances:
+            seq_to_uuid[utt.sequence_number] = utt.id
+            seq_to_times[utt.sequence_number] = (utt.timestamp_start, utt.timestamp_end)
 
         print(f"[INFO] Remapping sequence numbers to UUIDs using {len(seq_to_uuid)} utterances")
 
@@ -412,6 +416,12 @@ IMPORTANT:
                 print(f"[WARNING] Theme '{theme.get('label')}' has no valid utterances, skipping")
                 continue
 
+            cited_times = [seq_to_times[seq_num] for seq_num in sequence_numbers if seq_num in seq_to_times]
+            starts = [start for start, _ in cited_times if start is not None]
+            ends = [end for _, end in cited_times if end is not None]
+            timestamp_start = min(starts) if starts else None
+            timestamp_end = max(ends) if ends else None
+
             # Create Node
             node = Node(
                 id=uuid.uuid4(),
@@ -422,11 +432,11 @@ IMPORTANT:
                 level=2,  # Level 2 = thematic/coarse-grained
                 chunk_ids=[],  # Thematic nodes don't belong to specific chunks
                 utterance_ids=utterance_uuids,
-                timestamp_start=theme.get("timestamp_start"),
-                timestamp_end=theme.get("timestamp_end"),
+                timestamp_start=timestamp_start,
+                timestamp_end=timestamp_end,
                 duration_seconds=(
-                    theme.get("timestamp_end", 0) - theme.get("timestamp_start", 0)
-                    if theme.get("timestamp_end") and theme.get("timestamp_start")
+                    timestamp_end - timestamp_start
+                    if timestamp_start is not None and timestamp_end is not None
                     else None
                 ),
                 zoom_level_visible=[2],  # Visible at zoom level 2
@@ -440,8 +450,8 @@ IMPORTANT:
                 "summary": theme.get("summary"),
                 "utterance_ids": [str(uid) for uid in utterance_uuids],  # Convert UUIDs to strings for JSON
                 "node_type": theme.get("node_type"),
-                "timestamp_start": theme.get("timestamp_start"),
-                "timestamp_end": theme.get("timestamp_end")
+                "timestamp_start": timestamp_start,
+                "timestamp_end": timestamp_end
             })
             label_to_node_id[theme.get("label")] = node.id
 
@@ -490,10 +500,49 @@ IMPORTANT:
             }
         }
 
-    async def _serialize_existing_structure(
+    async def _fetch_existing_structure(
+        self,
+        conversation_id: str,
+        level: int = 2
+    ) -> Tuple[List[Node], List[Relationship]]:
+        """
+        Fetch nodes at a level together with their outgoing relationships
+
+        Uses a single outer-joined query (one DB round-trip) instead of
+        fetching nodes and relationships separately. Nodes without edges
+        still come back once with a NULL relationship.
+        """
+        conv_uuid = uuid.UUID(conversation_id)
+        result = await self.db.execute(
+            select(Node, Relationship)
+            .outerjoin(
+                Relationship,
+                and_(
+                    Relationship.from_node_id == Node.id,
+                    Relationship.conversation_id == conv_uuid
+                )
+            )
+            .where(
+                and_(
+                    Node.conversation_id == conv_uuid,
+                    Node.level == level
+                )
+            )
+        )
+
+        nodes_by_id: Dict[uuid.UUID, Node] = {}
+        relationships = []
+        for node, rel in result.all():
+            nodes_by_id.setdefault(node.id, node)
+            if rel is not None:
+                relationships.append(rel)
+
+        return list(nodes_by_id.values()), relationships
+
+    def _serialize_existing_structure(
         self,
         nodes: List[Node],
-        conversation_id: str
+        relationships: List[Relationship]
     ) -> Dict[str, Any]:
         """
         Serialize existing thematic structure from database
@@ -513,14 +562,6 @@ IMPORTANT:
             })
             node_id_to_label[node.id] = node.node_name
 
-        # Fetch relationships
-        edges_result = await self.db.execute(
-            select(Relationship).where(
-                Relationship.conversation_id == uuid.UUID(conversation_id)
-            )
-        )
-        relationships = edges_result.scalars().all()
-
         edges = []
         for rel in relationships:
             if rel.from_node_id in node_id_to_label and rel.to_node_id in node_id_to_label:
@@ -531,11 +572,15 @@ IMPORTANT:
                     "description": rel.explanation
                 })
 
-        # Debug logging for edge data flow
-        print(f"[DEBUG thematic_analyzer] Returning {len(edges)} edges from _serialize_existing_structure:")
-        for edge in edges:
-            print(f"  Edge: {edge['source']} -> {edge['target']} (type: {edge['type']})")
-        print(f"[DEBUG thematic_analyzer] Node IDs available: {list(node_id_to_label.keys())}")
+        # Debug logging for edge data flow (lazy formatting: free when DEBUG is off)
+        logger.debug(
+            "Returning %d edges from _serialize_existing_structure (nodes=%d)",
+            len(edges),
+            len(node_id_to_label),
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            for edge in edges:
+                logger.debug("Edge: %s -> %s (type: %s)", edge["source"], edge["target"], edge["type"])
 
         return {
             "thematic_nodes": thematic_nodes,
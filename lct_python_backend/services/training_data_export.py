@@ -6,17 +6,109 @@ Exports edit logs in formats suitable for AI model fine-tuning.
 Supports JSONL (OpenAI), CSV, and Markdown formats.
 """
 
-import json
 import csv
-from typing import List, Dict, Any, Optional
-from io import StringIO
+import orjson
+from typing import List, Dict, Any, Optional, Set, Tuple, Union, AsyncIterable, AsyncIterator
+from io import BytesIO, TextIOWrapper
+from functools import lru_cache
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Row, Select, select, and_
 import uuid
 
 from lct_python_backend.models import EditsLog, Node, Conversation
 
+TRAINING_SYSTEM_MESSAGE = (
+    "You are analyzing conversation transcripts and generating summaries, "
+    "titles, and keywords. Learn from user corrections to improve accuracy."
+)
+
+# Supported export formats and the media type each one is served with
+EXPORT_MEDIA_TYPES = {
+    "jsonl": "application/x-ndjson",
+    "csv": "text/csv",
+    "markdown": "text/markdown"
+}
+
+# Number of CSV rows encoded per writerows() call / streamed chunk
+CSV_BATCH_SIZE = 500
+
+_CSV_HEADER = (
+    b"edit_id,conversation_id,conversation_name,timestamp,"
+    b"target_type,target_id,field_name,"
+    b"old_value,new_value,"
+    b"edit_type,user_id,user_comment,user_confidence,"
+    b"exported_for_training,training_dataset_id\r\n"
+)
+
+# The system message is identical for every JSONL example; share one dict
+_SYSTEM_MESSAGE = {"role": "system", "content": TRAINING_SYSTEM_MESSAGE}
+
+# Markdown export is rendered from fixed templates: one format() call per edit
+_MARKDOWN_HEADER_TEMPLATE = (
+    "# Edit History: {conv_name}\n"
+    "\n"
+    "**Conversation ID:** `{conversation_id}`\n"
+    "**Exported:** {exported_at}\n"
+    "\n"
+    "---\n"
+    "\n"
+)
+
+_MARKDOWN_EDIT_TEMPLATE = (
+    "## Edit {index}: {field_name} - {timestamp}\n"
+    "\n"
+    "**Type:** {edit_type}\n"
+    "**Target:** {target_type} / `{target_id}`\n"
+    "**User:** {user_id}\n"
+    "**Confidence:** {user_confidence}\n"
+    "\n"
+    "**Original:**\n"
+    "```\n"
+    "{old_value}\n"
+    "```\n"
+    "\n"
+    "**Corrected:**\n"
+    "```\n"
+    "{new_value}\n"
+    "```\n"
+    "\n"
+    "{comment}"
+    "{export_status}"
+    "---\n"
+    "\n"
+)
+
+def _iso_timestamp(ts: datetime) -> str:
+    """ISO-8601 timestamp, cached because edits often share or repeat timestamps."""
+    # Aware datetimes in different zones compare equal, so the UTC offset is
+    # part of the cache key to keep the rendered offset correct
+    return _cached_iso_timestamp(ts, ts.utcoffset())
+
+
+def _display_timestamp(ts: datetime) -> str:
+    """'%Y-%m-%d %H:%M:%S' rendering of a timestamp (cached)."""
+    return _cached_display_timestamp(ts, ts.utcoffset())
+
+
+@lru_cache(maxsize=4096)
+def _cached_iso_timestamp(ts: datetime, _utcoffset) -> str:
+    return ts.isoformat()
+
+
+@lru_cache(maxsize=4096)
+def _cached_display_timestamp(ts: datetime, _utcoffset) -> str:
+    # f-string formatting skips strftime's format-string parsing
+    return f"{ts.year:04d}-{ts.month:02d}-{ts.day:02d} {ts.hour:02d}:{ts.minute:02d}:{ts.second:02d}"
+
+
+def _drain(buffer: BytesIO) -> bytes:
+    """Return everything written to a reusable buffer and reset it."""
+    value = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+    return value
+
 
 class TrainingDataExporter:
     """
@@ -33,9 +125,13 @@ class TrainingDataExporter:
 
     async def export_conversation_edits(
         self,
-        conversation_id: str,
+        conversation_id: Union[str, uuid.UUID],
         format: str = "jsonl",
-        unexported_only: bool = False
+        unexported_only: bool = False,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        conv_name: Optional[str] = None,
+        include_node_context: bool = True
     ) -> str:
         """
         Export all edits for a conversation
@@ -44,48 +140,150 @@ class TrainingDataExporter:
             conversation_id: UUID of conversation
             format: Export format ('jsonl', 'csv', 'markdown')
             unexported_only: Only export edits not yet exported
+            since: Only export edits created strictly after this time
+            limit: Maximum number of edits to export
+            conv_name: Conversation name, if the caller already knows it
+            include_node_context: Prefix JSONL node edits with node context
 
         Returns:
             Exported data as string
         """
-        # Get edits
-        query = select(EditsLog).where(
-            EditsLog.conversation_id == uuid.UUID(conversation_id)
-        )
+        return b"".join([
+            chunk async for chunk in self.stream_conversation_edits(
+                conversation_id,
+                format=format,
+                unexported_only=unexported_only,
+                since=since,
+                limit=limit,
+                conv_name=conv_name,
+                include_node_context=include_node_context
+            )
+        ]).decode("utf-8")
 
-        if unexported_only:
-            query = query.where(EditsLog.exported_for_training == False)
+    async def stream_conversation_edits(
+        self,
+        conversation_id: Union[str, uuid.UUID],
+        format: str = "jsonl",
+        unexported_only: bool = False,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        conv_name: Optional[str] = None,
+        include_node_context: bool = True
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream all edits for a conversation, one chunk per edit
 
-        query = query.order_by(EditsLog.created_at)
+        Lets the HTTP layer start sending before the whole export is built
+        (wrap in a StreamingResponse).
 
-        result = await self.db.execute(query)
-        edits = list(result.scalars().all())
+        Args:
+            conversation_id: UUID of conversation (already-parsed UUIDs are
+                used as-is instead of being re-parsed)
+            format: Export format ('jsonl', 'csv', 'markdown')
+            unexported_only: Only export edits not yet exported
+            since: Only export edits created strictly after this time, so
+                incremental exports resume from the last exported timestamp
+            limit: Maximum number of edits to export (bounds worst-case
+                latency and memory for long-lived conversations)
+            conv_name: Conversation name, if the caller already knows it
+                (e.g. exporting the same conversation in several formats);
+                skips joining the conversation row
+            include_node_context: Prefix JSONL node edits with the node's
+                summary; when False (or for CSV/Markdown, which never show
+                it) the node-context query is not run at all
+
+        Yields:
+            UTF-8 encoded chunks of exported data
+        """
+        if format not in EXPORT_MEDIA_TYPES:
+            raise ValueError(f"Unsupported format: {format}")
 
-        # Get conversation name
-        conv_result = await self.db.execute(
-            select(Conversation).where(Conversation.id == uuid.UUID(conversation_id))
-        )
-        conversation = conv_result.scalar_one_or_none()
-        conv_name = conversation.conversation_name if conversation else "Unknown"
+        # Parse once; the exporters only need the canonical string form
+        if isinstance(conversation_id, uuid.UUID):
+            conv_uuid = conversation_id
+        else:
+            conv_uuid = uuid.UUID(conversation_id)
+        conversation_id = str(conv_uuid)
+        edits_criteria = self._edits_criteria(conv_uuid, unexported_only, since)
+
+        # Only JSONL shows node context; load it for all node-targeted edits in
+        # one query up front, before the edits stream holds the connection
+        node_contexts = {}
+        if format == "jsonl" and include_node_context:
+            node_contexts = await self._batch_fetch_node_contexts(
+                select(EditsLog.target_id).where(
+                    and_(edits_criteria, EditsLog.target_type == 'node')
+                )
+            )
 
-        # Export based on format
+        if conv_name is None:
+            # Get conversation name and edits in one round-trip: outer-join edits
+            # onto the conversation so the name comes back even with zero edits
+            query = (
+                select(*EditsLog.__table__.c, Conversation.conversation_name)
+                .select_from(Conversation)
+                .outerjoin(EditsLog, edits_criteria)
+                .where(Conversation.id == conv_uuid)
+            )
+        else:
+            query = select(EditsLog.__table__).where(edits_criteria)
+        # id tiebreak keeps the order stable across paginated exports
+        query = query.order_by(EditsLog.created_at, EditsLog.id)
+        if limit is not None:
+            query = query.limit(limit)
+
+        # Stream rows so encoding overlaps with fetching instead of buffering
+        # the whole result set first. Rows are plain Core rows carrying the
+        # edits_log columns as attributes: export only reads edits, so ORM
+        # instance hydration would be wasted work.
+        result = await self.db.stream(query)
+        rows = aiter(result)
+        first_row = await anext(rows, None)
+        if conv_name is None:
+            conv_name = first_row.conversation_name if first_row is not None else "Unknown"
+
+        async def edits() -> AsyncIterator[Row]:
+            # With the outer join, a NULL edit id on the first row means no edits
+            if first_row is None or first_row.id is None:
+                return
+            yield first_row
+            async for row in rows:
+                yield row
+
+        # Export based on format (every exporter yields UTF-8 bytes)
         if format == "jsonl":
-            return await self._export_jsonl(edits, conversation_id, conv_name)
+            chunks = self._export_jsonl(edits(), conversation_id, conv_name, node_contexts)
         elif format == "csv":
-            return await self._export_csv(edits, conversation_id, conv_name)
-        elif format == "markdown":
-            return await self._export_markdown(edits, conversation_id, conv_name)
+            chunks = self._export_csv(edits(), conversation_id, conv_name)
         else:
-            raise ValueError(f"Unsupported format: {format}")
+            chunks = self._export_markdown(edits(), conversation_id, conv_name)
+
+        async for chunk in chunks:
+            yield chunk
+
+    @staticmethod
+    def _edits_criteria(
+        conv_uuid: uuid.UUID,
+        unexported_only: bool,
+        since: Optional[datetime] = None
+    ):
+        """Build the WHERE criteria selecting a conversation's exportable edits."""
+        criteria = EditsLog.conversation_id == conv_uuid
+        if unexported_only:
+            criteria = and_(criteria, EditsLog.exported_for_training == False)
+        if since is not None:
+            criteria = and_(criteria, EditsLog.created_at > since)
+        return criteria
 
     async def _export_jsonl(
         self,
-        edits: List[EditsLog],
+        edits: AsyncIterable[Row],
         conversation_id: str,
-        conv_name: str
-    ) -> str:
+        conv_name: str,
+        node_contexts: Dict[uuid.UUID, Dict[str, Any]]
+    ) -> AsyncIterator[bytes]:
         """
-        Export edits in JSONL format for OpenAI fine-tuning
+        Export edits in JSONL format for OpenAI fine-tuning (one line per chunk)
 
         Format:
         {
@@ -97,73 +295,56 @@ class TrainingDataExporter:
           "metadata": {...}
         }
         """
-        lines = []
-
-        system_message = (
-            "You are analyzing conversation transcripts and generating summaries, "
-            "titles, and keywords. Learn from user corrections to improve accuracy."
-        )
-
-        for edit in edits:
-            # Get node details if this is a node edit
-            node_context = await self._get_node_context(edit.target_id) if edit.target_type == 'node' else None
-
-            # Build messages
-            messages = [
-                {
-                    "role": "system",
-                    "content": system_message
-                }
-            ]
-
+        async for edit in edits:
             # User message with original AI output
-            if node_context:
-                user_content = f"Context: {node_context.get('utterances_preview', 'N/A')}\n\n"
-            else:
-                user_content = ""
-
-            user_content += f"Original {edit.field_name}: {edit.old_value or '(empty)'}"
-            messages.append({
-                "role": "user",
-                "content": user_content
-            })
-
-            # Assistant message with user correction
-            messages.append({
-                "role": "assistant",
-                "content": f"Corrected {edit.field_name}: {edit.new_value or '(empty)'}"
-            })
-
-            # Build training example
-            example = {
-                "messages": messages,
-                "metadata": {
-                    "conversation_id": conversation_id,
-                    "conversation_name": conv_name,
-                    "edit_id": str(edit.id),
-                    "edit_type": edit.edit_type,
-                    "target_type": edit.target_type,
-                    "target_id": str(edit.target_id),
-                    "field_name": edit.field_name,
-                    "timestamp": edit.created_at.isoformat() if edit.created_at else None,
-                    "user_id": edit.user_id,
-                    "user_comment": edit.user_comment,
-                    "user_confidence": edit.user_confidence
-                }
-            }
-
-            lines.append(json.dumps(example))
-
-        return "\n".join(lines)
+            user_content = f"Original {edit.field_name}: {edit.old_value or '(empty)'}"
+
+            # Prepend node details if this is a node edit (prefetched, no N+1).
+            # With no node contexts at all the per-edit type check is skipped.
+            if node_contexts and edit.target_type == 'node':
+                node_context = node_contexts.get(edit.target_id)
+                if node_context:
+                    user_content = (
+                        f"Context: {node_context.get('utterances_preview', 'N/A')}\n\n{user_content}"
+                    )
+
+            # orjson serializes UUIDs and datetimes natively and returns
+            # UTF-8 bytes with the trailing newline already appended
+            yield orjson.dumps(
+                {
+                    "messages": [
+                        _SYSTEM_MESSAGE,
+                        {"role": "user", "content": user_content},
+                        {
+                            "role": "assistant",
+                            "content": f"Corrected {edit.field_name}: {edit.new_value or '(empty)'}"
+                        }
+                    ],
+                    "metadata": {
+                        "conversation_id": conversation_id,
+                        "conversation_name": conv_name,
+                        "edit_id": edit.id,
+                        "edit_type": edit.edit_type,
+                        "target_type": edit.target_type,
+                        "target_id": edit.target_id,
+                        "field_name": edit.field_name,
+                        "timestamp": edit.created_at,
+                        "user_id": edit.user_id,
+                        "user_comment": edit.user_comment,
+                        "user_confidence": edit.user_confidence
+                    }
+                },
+                option=orjson.OPT_APPEND_NEWLINE
+            )
 
     async def _export_csv(
         self,
-        edits: List[EditsLog],
+        edits: AsyncIterable[Row],
         conversation_id: str,
         conv_name: str
-    ) -> str:
+    ) -> AsyncIterator[bytes]:
         """
-        Export edits in CSV format for analysis
+        Export edits in CSV format for analysis (one batch of rows per chunk)
 
         Columns:
         - edit_id, conversation_id, conversation_name, timestamp
@@ -172,27 +353,26 @@ class TrainingDataExporter:
         - edit_type, user_id, user_comment, user_confidence
         - exported_for_training
         """
-        output = StringIO()
-        writer = csv.writer(output)
-
-        # Header
-        writer.writerow([
-            'edit_id', 'conversation_id', 'conversation_name', 'timestamp',
-            'target_type', 'target_id', 'field_name',
-            'old_value', 'new_value',
-            'edit_type', 'user_id', 'user_comment', 'user_confidence',
-            'exported_for_training', 'training_dataset_id'
-        ])
-
-        # Rows
-        for edit in edits:
-            writer.writerow([
-                str(edit.id),
+        # Header (pre-encoded constant)
+        yield _CSV_HEADER
+
+        # csv.writer encodes straight into a reusable bytes buffer, so chunks
+        # leave here as UTF-8 without a separate encode pass
+        output = BytesIO()
+        writer = csv.writer(TextIOWrapper(output, encoding="utf-8", newline="", write_through=True))
+
+        # csv.writer stringifies UUIDs itself, so no per-edit str() calls;
+        # rows are tuples (cheaper to build than lists) and created_at is
+        # read once
+        def to_row(edit: Row) -> Tuple[Any, ...]:
+            created_at = edit.created_at
+            return (
+                edit.id,
                 conversation_id,
                 conv_name,
-                edit.created_at.isoformat() if edit.created_at else '',
+                _iso_timestamp(created_at) if created_at else '',
                 edit.target_type,
-                str(edit.target_id),
+                edit.target_id,
                 edit.field_name,
                 edit.old_value or '',
                 edit.new_value or '',
@@ -202,18 +382,30 @@ class TrainingDataExporter:
                 edit.user_confidence,
                 edit.exported_for_training,
                 edit.training_dataset_id or ''
-            ])
+            )
 
-        return output.getvalue()
+        # Rows: buffer streamed edits and hand each batch to writerows, which
+        # loops in C instead of one writerow call per edit
+        batch = []
+        async for edit in edits:
+            batch.append(edit)
+            if len(batch) >= CSV_BATCH_SIZE:
+                writer.writerows(to_row(e) for e in batch)
+                batch.clear()
+                yield _drain(output)
+
+        if batch:
+            writer.writerows(to_row(e) for e in batch)
+            yield _drain(output)
 
     async def _export_markdown(
         self,
-        edits: List[EditsLog],
+        edits: AsyncIterable[Row],
         conversation_id: str,
         conv_name: str
-    ) -> str:
+    ) -> AsyncIterator[bytes]:
         """
-        Export edits in Markdown format for human review
+        Export edits in Markdown format for human review (one edit per chunk)
 
         Format:
         # Edit History: {conversation_name}
@@ -237,101 +429,93 @@ class TrainingDataExporter:
         **Comment:** {user_comment}
 
         ---
+
+        **Total Edits:** {count}
+
+        The total is written as a footer because edits are streamed and the
+        count is only known at the end.
         """
-        lines = [
-            f"# Edit History: {conv_name}",
-            "",
-            f"**Conversation ID:** `{conversation_id}`",
-            f"**Total Edits:** {len(edits)}",
-            f"**Exported:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            "",
-            "---",
-            ""
-        ]
-
-        for i, edit in enumerate(edits, 1):
-            lines.extend([
-                f"## Edit {i}: {edit.field_name} - {edit.created_at.strftime('%Y-%m-%d %H:%M:%S') if edit.created_at else 'N/A'}",
-                "",
-                f"**Type:** {edit.edit_type}",
-                f"**Target:** {edit.target_type} / `{edit.target_id}`",
-                f"**User:** {edit.user_id}",
-                f"**Confidence:** {edit.user_confidence}",
-                ""
-            ])
-
-            # Old value
-            lines.extend([
-                "**Original:**",
-                "```",
-                edit.old_value or "(empty)",
-                "```",
-                ""
-            ])
-
-            # New value
-            lines.extend([
-                "**Corrected:**",
-                "```",
-                edit.new_value or "(empty)",
-                "```",
-                ""
-            ])
-
-            # Comment
-            if edit.user_comment:
-                lines.extend([
-                    f"**Comment:** {edit.user_comment}",
-                    ""
-                ])
-
-            # Export status
-            if edit.exported_for_training:
-                lines.extend([
-                    f"**Exported:** Yes (Dataset: `{edit.training_dataset_id}`)",
-                    ""
-                ])
-
-            lines.extend([
-                "---",
-                ""
-            ])
-
-        return "\n".join(lines)
-
-    async def _get_node_context(self, node_id: uuid.UUID) -> Optional[Dict[str, Any]]:
+        yield _MARKDOWN_HEADER_TEMPLATE.format(
+            conv_name=conv_name,
+            conversation_id=conversation_id,
+            exported_at=_display_timestamp(datetime.now())
+        ).encode("utf-8")
+
+        total_edits = 0
+        async for edit in edits:
+            total_edits += 1
+            yield _MARKDOWN_EDIT_TEMPLATE.format(
+                index=total_edits,
+                field_name=edit.field_name,
+                timestamp=_display_timestamp(edit.created_at) if edit.created_at else 'N/A',
+                edit_type=edit.edit_type,
+                target_type=edit.target_type,
+                target_id=edit.target_id,
+                user_id=edit.user_id,
+                user_confidence=edit.user_confidence,
+                old_value=edit.old_value or "(empty)",
+                new_value=edit.new_value or "(empty)",
+                comment=f"**Comment:** {edit.user_comment}\n\n" if edit.user_comment else "",
+                export_status=(
+                    f"**Exported:** Yes (Dataset: `{edit.training_dataset_id}`)\n\n"
+                    if edit.exported_for_training else ""
+                )
+            ).encode("utf-8")
+
+        yield b"**Total Edits:** %d\n" % total_edits
+
+    async def _batch_fetch_node_contexts(
+        self,
+        node_ids: Union[Set[uuid.UUID], Select]
+    ) -> Dict[uuid.UUID, Dict[str, Any]]:
         """
-        Get context about a node for training data
+        Get context for many nodes with a single `WHERE id IN (...)` query
+
+        Only the columns needed for the context are selected, so no ORM
+        Node objects are hydrated.
 
         Args:
-            node_id: UUID of node
+            node_ids: UUIDs of nodes, or a SELECT yielding node UUIDs
+                (used as an IN-subquery)
 
         Returns:
-            Dict with node context (utterances preview, etc.)
+            Dict mapping node UUID to node context (missing nodes are omitted)
         """
+        if isinstance(node_ids, (set, frozenset)) and not node_ids:
+            return {}
+
         try:
             result = await self.db.execute(
-                select(Node).where(Node.id == node_id)
+                select(Node.id, Node.node_name, Node.summary, Node.key_points)
+                .where(Node.id.in_(node_ids))
             )
-            node = result.scalar_one_or_none()
-
-            if not node:
-                return None
-
-            # Get utterances preview (first 200 chars of summary)
-            summary_preview = node.summary[:200] + "..." if node.summary and len(node.summary) > 200 else node.summary
-
             return {
-                "node_name": node.node_name,
-                "summary": node.summary,
-                "utterances_preview": summary_preview,
-                "key_points": node.key_points or []
+                row.id: self._build_node_context(row.node_name, row.summary, row.key_points)
+                for row in result
             }
         except Exception as e:
-            print(f"[WARNING] Failed to get node context: {e}")
-            return None
+            print(f"[WARNING] Failed to batch fetch node contexts: {e}")
+            return {}
+
+    @staticmethod
+    def _build_node_context(
+        node_name: str,
+        summary: Optional[str],
+        key_points: Optional[List[str]]
+    ) -> Dict[str, Any]:
+        """Build the training-data context dict for a node."""
+        # Get utterances preview (first 200 chars of summary)
+        summary_preview = summary[:200] + "..." if summary and len(summary) > 200 else summary
+
+        return {
+            "node_name": node_name,
+            "summary": summary,
+            "utterances_preview": summary_preview,
+            "key_points": key_points or []
+        }
 
-    async def generate_dataset_id(self, conversation_id: str) -> str:
+    @staticmethod
+    async def generate_dataset_id(conversation_id: str) -> str:
         """
         Generate a unique training dataset ID
 
@@ -1,15 +1,22 @@
+import asyncio
+import atexit
+import itertools
 import json
 import logging
 import os
 import random
+import re
+import threading
 import time
 import uuid
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import httpx
-from google import genai
-from google.genai import types
+import orjson
 
+from lct_python_backend.services.llm_cache import LLMCache, make_cache_key, prompt_fingerprint
 from lct_python_backend.services.llm_config import get_env_llm_defaults
 from lct_python_backend.services.local_llm_client import extract_json_from_text
 
@@ -18,8 +25,49 @@ logger = logging.getLogger("lct_backend")
 GEMINI_MODEL_NAME = os.getenv("ONLINE_LLM_CHAT_MODEL", "gemini-2.5-flash")
 TRACE_API_CALLS = os.getenv("TRACE_API_CALLS", "true").strip().lower() in {"1", "true", "yes", "on"}
 API_LOG_PREVIEW_CHARS = int(os.getenv("API_LOG_PREVIEW_CHARS", "280"))
-_JSON_OBJECT_UNSUPPORTED_BASE_URLS: set[str] = set()
+JSON_OBJECT_UNSUPPORTED_TTL_SECONDS = 3600
+# Upload long system prompts once as Gemini cached content instead of sending
+# them with every request (billed for storage; prompts under the model's minimum
+# cache size fall back to inline system instructions).
+GEMINI_CONTEXT_CACHE_ENABLED = os.getenv("GEMINI_CONTEXT_CACHE", "false").strip().lower() in {"1", "true", "yes", "on"}
+GEMINI_CONTEXT_CACHE_TTL_SECONDS = int(os.getenv("GEMINI_CONTEXT_CACHE_TTL_SECONDS", "3600"))
+_JSON_OBJECT_UNSUPPORTED_MAX_ENTRIES = 256
+# base_url -> monotonic time after which response_format support is re-probed.
+_JSON_OBJECT_UNSUPPORTED_BASE_URLS: Dict[str, float] = {}
+_LOCAL_HTTP_CLIENT: Optional[httpx.Client] = None
+_LOCAL_HTTP_CLIENT_LOCK = threading.Lock()
+# Chat payloads are serialized with orjson and posted as raw content.
+_JSON_HEADERS = {"Content-Type": "application/json"}
 _GEMINI_KEY_ENV_ORDER = ("GOOGLEAI_API_KEY", "GEMINI_API_KEY", "GEMINI_KEY")
+_RETRY_CAP_SECONDS = 8.0
+_RATE_LIMIT_COOLDOWN_CAP_SECONDS = 30.0
+# Client errors that fail the same way on every attempt (bad request, auth, unknown model).
+_NON_RETRYABLE_STATUS_CODES = frozenset({400, 401, 403, 404, 422})
+# backend ("gemini" or local base_url) -> monotonic time before which no call is made.
+_RATE_LIMIT_COOLDOWNS: Dict[str, float] = {}
+_GENAI_MODULES: Optional[Tuple[Any, Any]] = None
+# api key -> genai.Client; each client keeps its own pooled HTTPS connections.
+_GEMINI_CLIENTS: Dict[str, Any] = {}
+# (api key, model, prompt fingerprint) -> (cached content name or None, monotonic
+# refresh time). None records a failed create so it isn't retried every call.
+_GEMINI_PROMPT_CACHES: Dict[Tuple[str, str, str], Tuple[Optional[str], float]] = {}
+# Inputs shorter than this (after stripping) skip the LLM entirely; by default
+# only blank input is skipped. Raise via env to also drop near-empty flushes.
+MIN_TRANSCRIPT_CHARS = int(os.getenv("LCT_MIN_TRANSCRIPT_CHARS", "1"))
+# Live batches shorter than this are assumed to hold no finished segment yet and
+# keep accumulating without asking the LLM (0 = always ask). Flushes still do.
+MIN_ACCUMULATE_CHARS = int(os.getenv("LCT_MIN_ACCUMULATE_CHARS", "0"))
+# The most recent nodes go into the generation prompt in full; older ones only
+# as name/summary/links/bookmark, which is what the model needs to link back to them.
+PROMPT_FULL_NODE_COUNT = int(os.getenv("LCT_PROMPT_FULL_NODE_COUNT", "8"))
+PROMPT_NODE_SUMMARY_CHARS = int(os.getenv("LCT_PROMPT_NODE_SUMMARY_CHARS", "200"))
+# Cap on how many of those older summaries are sent (0 = all). Setting it keeps
+# the prompt size fixed in long sessions at the cost of links to early nodes.
+PROMPT_SUMMARY_NODE_LIMIT = int(os.getenv("LCT_PROMPT_SUMMARY_NODE_LIMIT", "0"))
+LLM_RESPONSE_CACHE_SIZE = int(os.getenv("LLM_RESPONSE_CACHE_SIZE", "512"))
+LLM_RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("LLM_RESPONSE_CACHE_TTL_SECONDS", "3600"))
+# Identical inputs (re-runs, retries after upstream failures) skip the LLM call.
+_LLM_RESPONSE_CACHE = LLMCache(maxsize=LLM_RESPONSE_CACHE_SIZE, ttl_seconds=LLM_RESPONSE_CACHE_TTL_SECONDS)
 
 GENERATE_LCT_PROMPT = """You are an advanced AI model that structures conversations into strictly JSON-formatted nodes. Each conversational shift should be captured as a new node with defined relationships, with primary emphasis on capturing rich contextual connections that demonstrate thematic coherence, conceptual evolution, and cross-conversational idea building.
 **Formatting Rules:**
@@ -192,7 +240,12 @@ def _resolve_llm_config(config: Optional[Dict[str, Any]] = None) -> Dict[str, An
 
 def _resolve_online_gemini_model(llm_config: Optional[Dict[str, Any]] = None) -> str:
     config = _resolve_llm_config(llm_config)
-    configured = str(config.get("chat_model") or "").strip()
+    return _normalize_online_gemini_model(str(config.get("chat_model") or ""), GEMINI_MODEL_NAME)
+
+
+@lru_cache(maxsize=32)
+def _normalize_online_gemini_model(chat_model: str, default_model: str) -> str:
+    configured = chat_model.strip()
     if configured.startswith("models/"):
         configured = configured[len("models/") :]
     if "/" in configured and "gemini" in configured.lower():
@@ -202,10 +255,17 @@ def _resolve_online_gemini_model(llm_config: Optional[Dict[str, Any]] = None) ->
 
     if "gemini" in configured.lower():
         return configured
-    return GEMINI_MODEL_NAME
+    return default_model
 
 
 def _resolve_gemini_api_key() -> Tuple[Optional[str], Optional[str]]:
+    return _resolve_gemini_api_key_cached()
+
+
+# Keys only come from the environment, which nothing changes at runtime, so
+# they are read once per process; rotating a key means restarting the backend.
+@lru_cache(maxsize=1)
+def _resolve_gemini_api_key_cached() -> Tuple[Optional[str], Optional[str]]:
     for env_name in _GEMINI_KEY_ENV_ORDER:
         value = str(os.getenv(env_name, "")).strip()
         if value:
@@ -227,22 +287,165 @@ def _preview_text(value: Any, limit: int = API_LOG_PREVIEW_CHARS) -> str:
     return f"{text[:limit]}...<truncated {len(text) - limit} chars>"
 
 
+class _LazyPreview:
+    """Defers _preview_text until a log record is actually formatted."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __str__(self) -> str:
+        return _preview_text(self.value)
+
+
 def _trace_api_call(message: str, *args: Any) -> None:
     if TRACE_API_CALLS:
         logger.info(message, *args)
 
 
-_THREAD_STATES = {"new_thread", "continue_thread", "return_to_thread"}
-_RELATION_TYPES = {
-    "supports",
-    "rebuts",
-    "clarifies",
-    "asks",
-    "tangent",
-    "return_to_thread",
-    "contextual",
-    "temporal_next",
-}
+def _ensure_genai() -> Tuple[Any, Any]:
+    """Import the Google GenAI SDK on first use.
+
+    The SDK pulls in a large dependency tree; deferring it keeps start-up cheap
+    for deployments that only use the local LLM path.
+    """
+    global _GENAI_MODULES
+    if _GENAI_MODULES is None:
+        from google import genai
+        from google.genai import types
+
+        _GENAI_MODULES = (genai, types)
+    return _GENAI_MODULES
+
+
+@lru_cache(maxsize=None)
+def _system_prompt_part(prompt: str) -> Any:
+    # System prompts are constant, so their Parts are built once rather than per request.
+    _genai, types = _ensure_genai()
+    return types.Part.from_text(text=prompt)
+
+
+@lru_cache(maxsize=1)
+def _accumulate_response_schema() -> Any:
+    genai, _types = _ensure_genai()
+    return genai.types.Schema(
+        type=genai.types.Type.OBJECT,
+        properties={
+            "decision": genai.types.Schema(type=genai.types.Type.STRING),
+            "Completed_segment": genai.types.Schema(type=genai.types.Type.STRING),
+            "Incomplete_segment": genai.types.Schema(type=genai.types.Type.STRING),
+            "detected_threads": genai.types.Schema(
+                type=genai.types.Type.ARRAY,
+                items=genai.types.Schema(type=genai.types.Type.STRING),
+            ),
+        },
+    )
+
+
+def _is_trivial_input(text: Optional[str]) -> bool:
+    return len((text or "").strip()) < MIN_TRANSCRIPT_CHARS
+
+
+def _continue_accumulating_result(input_text: str) -> Dict[str, Any]:
+    return {
+        "decision": "continue_accumulating",
+        "Completed_segment": "",
+        "Incomplete_segment": input_text,
+        "detected_threads": [],
+    }
+
+
+def _retry_delay(backoff_base: float, attempt: int) -> float:
+    # Full jitter keeps concurrent workers from retrying in lockstep.
+    return random.uniform(0, min(_RETRY_CAP_SECONDS, backoff_base ** attempt))
+
+
+def _failure_status_code(exc: Optional[BaseException]) -> Optional[int]:
+    # genai APIError carries `.code`; httpx.HTTPStatusError carries `.response`.
+    if exc is None:
+        return None
+    return getattr(exc, "code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+
+
+def _rate_limit_retry_after(exc: Optional[BaseException]) -> Optional[float]:
+    """Cooldown in seconds if `exc` is an HTTP 429, else None."""
+    if _failure_status_code(exc) != 429:
+        return None
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        retry_after = float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        retry_after = _RETRY_CAP_SECONDS
+    return min(max(retry_after, 0.0), _RATE_LIMIT_COOLDOWN_CAP_SECONDS)
+
+
+def _wait_for_rate_limit(backend: str) -> None:
+    # Skip calls we already know would be rejected until the cooldown expires.
+    until = _RATE_LIMIT_COOLDOWNS.get(backend)
+    if until is None:
+        return
+    remaining = until - time.monotonic()
+    if remaining > 0:
+        logger.info("[LLM API] %s rate limited; waiting %.1fs before calling.", backend, remaining)
+        time.sleep(remaining)
+    _RATE_LIMIT_COOLDOWNS.pop(backend, None)
+
+
+def _backoff_before_retry(
+    backend: str,
+    failure: Optional[BaseException],
+    backoff_base: float,
+    attempt: int,
+    retries: int,
+    force_retry: bool = False,
+) -> bool:
+    """Sleep before the next attempt; False if there's no point making one."""
+    retry_after = _rate_limit_retry_after(failure)
+    if retry_after is not None:
+        _RATE_LIMIT_COOLDOWNS[backend] = time.monotonic() + retry_after
+    if attempt + 1 >= retries:
+        return False
+    if not force_retry and _failure_status_code(failure) in _NON_RETRYABLE_STATUS_CODES:
+        logger.warning("[LLM API] %s rejected the request; not retrying.", backend)
+        return False
+    if retry_after is None:
+        time.sleep(_retry_delay(backoff_base, attempt))
+    return True
+
+
+# Runs of anything but letters/digits (Unicode-aware, like str.isalnum).
+_SLUG_SEPARATOR_RE = re.compile(r"[\W_]+")
+# Byte table mapping everything but [a-z0-9] to "-" (input is lowercased first).
+_SLUG_ASCII_TABLE = bytes(
+    byte if (ord("a") <= byte <= ord("z") or ord("0") <= byte <= ord("9")) else ord("-")
+    for byte in range(256)
+)
+_THREAD_STATES = frozenset({"new_thread", "continue_thread", "return_to_thread"})
+_RELATION_TYPES = frozenset(
+    {
+        "supports",
+        "rebuts",
+        "clarifies",
+        "asks",
+        "tangent",
+        "return_to_thread",
+        "contextual",
+        "temporal_next",
+    }
+)
+# Substring fallbacks for free-form relation types, checked in priority order.
+_RELATION_TYPE_NEEDLES = (
+    ("support", "supports"),
+    ("rebut", "rebuts"),
+    ("contradict", "rebuts"),
+    ("clarif", "clarifies"),
+    ("question", "asks"),
+    ("ask", "asks"),
+    ("return", "return_to_thread"),
+    ("tangent", "tangent"),
+    ("branch", "tangent"),
+)
 
 
 def _as_clean_str(value: Any) -> str:
@@ -252,12 +455,20 @@ def _as_clean_str(value: Any) -> str:
 
 
 def _as_string_list(value: Any) -> List[str]:
-    if not isinstance(value, list):
+    if not isinstance(value, list) or not value:
         return []
-    seen = set()
+    clean = _as_clean_str
     output: List[str] = []
+    if len(value) <= 8:
+        # Short lists (the usual case): a linear scan beats allocating a set.
+        for item in value:
+            text = clean(item)
+            if text and text not in output:
+                output.append(text)
+        return output
+    seen = set()
     for item in value:
-        text = _as_clean_str(item)
+        text = clean(item)
         if not text or text in seen:
             continue
         seen.add(text)
@@ -266,20 +477,28 @@ def _as_string_list(value: Any) -> List[str]:
 
 
 def _as_string_map(value: Any) -> Dict[str, str]:
-    if not isinstance(value, dict):
+    if not isinstance(value, dict) or not value:
         return {}
+    clean = _as_clean_str
     normalized: Dict[str, str] = {}
     for key, map_value in value.items():
-        normalized_key = _as_clean_str(key)
-        normalized_value = _as_clean_str(map_value)
+        normalized_key = clean(key)
+        normalized_value = clean(map_value)
         if normalized_key and normalized_value:
             normalized[normalized_key] = normalized_value
     return normalized
 
 
 def _slugify(value: str) -> str:
-    cleaned = "".join(char.lower() if char.isalnum() else "-" for char in value)
-    slug = "-".join(segment for segment in cleaned.split("-") if segment)
+    lowered = value.lower()
+    if lowered.isascii():
+        # ASCII fast path: one C-level byte translate instead of the regex engine.
+        slug = lowered.encode("ascii").translate(_SLUG_ASCII_TABLE).decode("ascii")
+        while "--" in slug:
+            slug = slug.replace("--", "-")
+        slug = slug.strip("-")
+    else:
+        slug = _SLUG_SEPARATOR_RE.sub("-", lowered).strip("-")
     return slug[:48] or "untitled-thread"
 
 
@@ -298,21 +517,28 @@ def _normalize_relation_type(value: Any) -> str:
     raw = _as_clean_str(value).lower()
     if raw in _RELATION_TYPES:
         return raw
-    if "support" in raw:
-        return "supports"
-    if "rebut" in raw or "contradict" in raw:
-        return "rebuts"
-    if "clarif" in raw:
-        return "clarifies"
-    if "question" in raw or "ask" in raw:
-        return "asks"
-    if "return" in raw:
-        return "return_to_thread"
-    if "tangent" in raw or "branch" in raw:
-        return "tangent"
+    for needle, relation_type in _RELATION_TYPE_NEEDLES:
+        if needle in raw:
+            return relation_type
     return "contextual"
 
 
+# Alternate spellings models use for edge fields, in precedence order.
+_EDGE_SOURCE_KEYS = ("related_node", "relatedNode", "source", "from", "node")
+_EDGE_TEXT_KEYS = ("relation_text", "relationText", "description", "explanation")
+_EDGE_TYPE_KEYS = ("relation_type", "type")
+
+
+def _first_present(item: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    # Same result as chaining item.get(k1) or item.get(k2) or ...
+    value = None
+    for key in keys:
+        value = item.get(key)
+        if value:
+            break
+    return value
+
+
 def _normalize_edge_relations(value: Any) -> List[Dict[str, str]]:
     if not isinstance(value, list):
         return []
@@ -321,22 +547,11 @@ def _normalize_edge_relations(value: Any) -> List[Dict[str, str]]:
     for item in value:
         if not isinstance(item, dict):
             continue
-        related_node = _as_clean_str(
-            item.get("related_node")
-            or item.get("relatedNode")
-            or item.get("source")
-            or item.get("from")
-            or item.get("node")
-        )
-        relation_text = _as_clean_str(
-            item.get("relation_text")
-            or item.get("relationText")
-            or item.get("description")
-            or item.get("explanation")
-        )
-        relation_type = _normalize_relation_type(item.get("relation_type") or item.get("type"))
+        related_node = _as_clean_str(_first_present(item, _EDGE_SOURCE_KEYS))
         if not related_node:
             continue
+        relation_text = _as_clean_str(_first_present(item, _EDGE_TEXT_KEYS))
+        relation_type = _normalize_relation_type(_first_present(item, _EDGE_TYPE_KEYS))
         if not relation_text:
             relation_text = f"{related_node} -> current node"
         key = (related_node, relation_type, relation_text)
@@ -353,7 +568,20 @@ def _normalize_edge_relations(value: Any) -> List[Dict[str, str]]:
     return normalized
 
 
-def _normalize_generated_output(parsed: Any) -> List[Dict[str, Any]]:
+def _assign_missing_ids(nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Cached responses are stored without generated ids and get fresh ones on
+    # every return, so two sessions replaying the same segment never share ids.
+    missing = [node for node in nodes if not node["id"]]
+    if not missing:
+        return nodes
+    # One urandom read for all generated ids instead of one per uuid4() call.
+    entropy = os.urandom(16 * len(missing))
+    for index, node in enumerate(missing):
+        node["id"] = str(uuid.UUID(bytes=entropy[index * 16 : (index + 1) * 16], version=4))
+    return nodes
+
+
+def _normalize_generated_output(parsed: Any, assign_ids: bool = True) -> List[Dict[str, Any]]:
     if isinstance(parsed, list):
         raw_nodes = parsed
         raw_edges = []
@@ -369,37 +597,9 @@ def _normalize_generated_output(parsed: Any) -> List[Dict[str, Any]]:
     else:
         return []
 
+    # Single pass over raw nodes: normalize each one and record its id -> name
+    # mapping; edges that reference ids are resolved afterwards.
     id_to_name: Dict[str, str] = {}
-    for raw in raw_nodes:
-        if not isinstance(raw, dict):
-            continue
-        node_name = _as_clean_str(raw.get("node_name") or raw.get("title") or raw.get("name"))
-        raw_id = _as_clean_str(raw.get("id") or raw.get("node_id"))
-        if node_name and raw_id:
-            id_to_name[raw_id] = node_name
-
-    incoming_edges_by_target: Dict[str, List[Dict[str, str]]] = {}
-    for raw_edge in raw_edges:
-        if not isinstance(raw_edge, dict):
-            continue
-        source_raw = _as_clean_str(raw_edge.get("source") or raw_edge.get("from") or raw_edge.get("from_node"))
-        target_raw = _as_clean_str(raw_edge.get("target") or raw_edge.get("to") or raw_edge.get("to_node"))
-        source_name = id_to_name.get(source_raw, source_raw)
-        target_name = id_to_name.get(target_raw, target_raw)
-        if not source_name or not target_name:
-            continue
-        entry = {
-            "related_node": source_name,
-            "relation_type": _normalize_relation_type(raw_edge.get("relation_type") or raw_edge.get("type")),
-            "relation_text": _as_clean_str(
-                raw_edge.get("relation_text")
-                or raw_edge.get("description")
-                or raw_edge.get("label")
-            )
-            or f"{source_name} -> {target_name}",
-        }
-        incoming_edges_by_target.setdefault(target_name, []).append(entry)
-
     normalized_nodes: List[Dict[str, Any]] = []
     for raw in raw_nodes:
         if not isinstance(raw, dict):
@@ -408,6 +608,9 @@ def _normalize_generated_output(parsed: Any) -> List[Dict[str, Any]]:
         node_name = _as_clean_str(raw.get("node_name") or raw.get("title") or raw.get("name"))
         if not node_name:
             continue
+        raw_id = _as_clean_str(raw.get("id") or raw.get("node_id"))
+        if raw_id:
+            id_to_name[raw_id] = node_name
 
         predecessor = _as_clean_str(raw.get("predecessor")) or None
         successor = _as_clean_str(raw.get("successor")) or None
@@ -415,7 +618,6 @@ def _normalize_generated_output(parsed: Any) -> List[Dict[str, Any]]:
         source_excerpt = _as_clean_str(raw.get("source_excerpt") or raw.get("source") or summary)
         contextual_relation = _as_string_map(raw.get("contextual_relation"))
         edge_relations = _normalize_edge_relations(raw.get("edge_relations"))
-        edge_relations.extend(incoming_edges_by_target.get(node_name, []))
 
         for relation in edge_relations:
             related_name = relation["related_node"]
@@ -432,7 +634,7 @@ def _normalize_generated_output(parsed: Any) -> List[Dict[str, Any]]:
 
         normalized_nodes.append(
             {
-                "id": _as_clean_str(raw.get("id") or raw.get("node_id")) or str(uuid.uuid4()),
+                "id": raw_id,
                 "node_name": node_name,
                 "summary": summary,
                 "node_text": summary,
@@ -450,9 +652,141 @@ def _normalize_generated_output(parsed: Any) -> List[Dict[str, Any]]:
                 "chunk_id": raw.get("chunk_id"),
             }
         )
+
+    if assign_ids:
+        _assign_missing_ids(normalized_nodes)
+
+    if not raw_edges:
+        return normalized_nodes
+
+    incoming_edges_by_target: Dict[str, List[Dict[str, str]]] = {}
+    for raw_edge in raw_edges:
+        if not isinstance(raw_edge, dict):
+            continue
+        source_raw = _as_clean_str(raw_edge.get("source") or raw_edge.get("from") or raw_edge.get("from_node"))
+        target_raw = _as_clean_str(raw_edge.get("target") or raw_edge.get("to") or raw_edge.get("to_node"))
+        source_name = id_to_name.get(source_raw, source_raw)
+        target_name = id_to_name.get(target_raw, target_raw)
+        if not source_name or not target_name:
+            continue
+        entry = {
+            "related_node": source_name,
+            "relation_type": _normalize_relation_type(raw_edge.get("relation_type") or raw_edge.get("type")),
+            "relation_text": _as_clean_str(
+                raw_edge.get("relation_text")
+                or raw_edge.get("description")
+                or raw_edge.get("label")
+            )
+            or f"{source_name} -> {target_name}",
+        }
+        incoming_edges_by_target.setdefault(target_name, []).append(entry)
+
+    # Patch incoming edges onto their targets, appending after each node's own
+    # relations exactly as if they had been part of its edge_relations.
+    for node in normalized_nodes:
+        incoming = incoming_edges_by_target.get(node["node_name"])
+        if not incoming:
+            continue
+        node["edge_relations"].extend(incoming)
+        contextual_relation = node["contextual_relation"]
+        linked_nodes = node["linked_nodes"]
+        for relation in incoming:
+            related_name = relation["related_node"]
+            if related_name not in contextual_relation:
+                contextual_relation[related_name] = relation["relation_text"]
+                if related_name not in linked_nodes:
+                    linked_nodes.append(related_name)
     return normalized_nodes
 
 
+def _normalize_response_text(response_text: str) -> List[Dict[str, Any]]:
+    """Parse and normalize a raw JSON response, leaving missing node ids empty.
+
+    Raises json.JSONDecodeError (orjson.JSONDecodeError subclasses it) when the
+    response is not valid JSON.
+    """
+    return _normalize_generated_output(orjson.loads(response_text), assign_ids=False)
+
+
+def _json_object_unsupported(base_url: str) -> bool:
+    expires_at = _JSON_OBJECT_UNSUPPORTED_BASE_URLS.get(base_url)
+    if expires_at is None:
+        return False
+    if time.monotonic() >= expires_at:
+        # Re-probe: the endpoint may have gained response_format support since.
+        _JSON_OBJECT_UNSUPPORTED_BASE_URLS.pop(base_url, None)
+        return False
+    return True
+
+
+def _mark_json_object_unsupported(base_url: str) -> None:
+    _JSON_OBJECT_UNSUPPORTED_BASE_URLS.pop(base_url, None)
+    _JSON_OBJECT_UNSUPPORTED_BASE_URLS[base_url] = time.monotonic() + JSON_OBJECT_UNSUPPORTED_TTL_SECONDS
+    while len(_JSON_OBJECT_UNSUPPORTED_BASE_URLS) > _JSON_OBJECT_UNSUPPORTED_MAX_ENTRIES:
+        oldest = next(iter(_JSON_OBJECT_UNSUPPORTED_BASE_URLS))
+        _JSON_OBJECT_UNSUPPORTED_BASE_URLS.pop(oldest, None)
+
+
+def _get_local_http_client() -> httpx.Client:
+    # One pool for every local call (timeouts are per request), so keep-alive
+    # connections survive across calls, retries and config changes.
+    global _LOCAL_HTTP_CLIENT
+    client = _LOCAL_HTTP_CLIENT
+    if client is None:
+        with _LOCAL_HTTP_CLIENT_LOCK:
+            client = _LOCAL_HTTP_CLIENT
+            if client is None:
+                client = httpx.Client(limits=httpx.Limits(max_keepalive_connections=16))
+                atexit.register(client.close)
+                _LOCAL_HTTP_CLIENT = client
+    return client
+
+
+@dataclass(frozen=True)
+class _LocalChatSettings:
+    base_url: str
+    chat_url: str
+    chat_model: Any
+    json_mode: bool
+    timeout_seconds: float
+    cache_prompt: bool
+
+
+@lru_cache(maxsize=32)
+def _materialize_local_chat_settings(
+    base_url: Any,
+    chat_model: Any,
+    json_mode: Any,
+    timeout_seconds: Any,
+    cache_prompt: Any = False,
+) -> _LocalChatSettings:
+    normalized_base_url = str(base_url).rstrip("/")
+    return _LocalChatSettings(
+        base_url=normalized_base_url,
+        chat_url=f"{normalized_base_url}/v1/chat/completions",
+        chat_model=chat_model,
+        json_mode=bool(json_mode),
+        timeout_seconds=float(timeout_seconds),
+        cache_prompt=bool(cache_prompt),
+    )
+
+
+def _local_chat_settings(config: Dict[str, Any]) -> _LocalChatSettings:
+    # The same few config dicts are reused for every call, so coerce them once.
+    fields = (
+        config.get("base_url", ""),
+        config.get("chat_model", "glm-4.6v-flash"),
+        config.get("json_mode", True),
+        config.get("timeout_seconds", 120),
+        config.get("cache_prompt", False),
+    )
+    try:
+        return _materialize_local_chat_settings(*fields)
+    except TypeError:
+        # Unhashable override values (e.g. from stored settings) can't be cached.
+        return _materialize_local_chat_settings.__wrapped__(*fields)
+
+
 def _call_local_chat_json(
     prompt: str,
     system_prompt: str,
@@ -460,12 +794,13 @@ def _call_local_chat_json(
     temperature: float = 0.65,
     max_tokens: int = 4000,
 ) -> Any:
-    base_url = str(config.get("base_url", "")).rstrip("/")
+    settings = _local_chat_settings(config)
+    base_url = settings.base_url
     if not base_url:
         raise ValueError("Local LLM base_url is required.")
 
     payload = {
-        "model": config.get("chat_model", "glm-4.6v-flash"),
+        "model": settings.chat_model,
         "messages": [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": prompt},
@@ -474,12 +809,17 @@ def _call_local_chat_json(
         "max_tokens": max_tokens,
     }
 
-    use_json_object = bool(config.get("json_mode", True)) and base_url not in _JSON_OBJECT_UNSUPPORTED_BASE_URLS
+    if settings.cache_prompt:
+        # The system prompt is an identical prefix on every call; let the server
+        # keep its KV cache instead of re-running prefill.
+        payload["cache_prompt"] = True
+
+    use_json_object = settings.json_mode and not _json_object_unsupported(base_url)
     if use_json_object:
         payload["response_format"] = {"type": "json_object"}
 
-    url = f"{base_url}/v1/chat/completions"
-    timeout = float(config.get("timeout_seconds", 120))
+    url = settings.chat_url
+    timeout = settings.timeout_seconds
     _trace_api_call(
         "[LLM API] POST %s model=%s prompt_chars=%s json_mode=%s",
         url,
@@ -487,41 +827,215 @@ def _call_local_chat_json(
         len(str(prompt or "")),
         "json_object" if "response_format" in payload else "none",
     )
-    with httpx.Client(timeout=timeout) as client:
-        try:
-            response = client.post(url, json=payload)
-            response.raise_for_status()
-            raw_json = response.json()
-            content = raw_json["choices"][0]["message"]["content"]
+    client = _get_local_http_client()
+    try:
+        response = client.post(url, content=orjson.dumps(payload), headers=_JSON_HEADERS, timeout=timeout)
+        response.raise_for_status()
+        raw_json = orjson.loads(response.content)
+        content = raw_json["choices"][0]["message"]["content"]
+        _trace_api_call(
+            "[LLM API] %s status=%s content_preview=%s",
+            url,
+            response.status_code,
+            _LazyPreview(content),
+        )
+        return extract_json_from_text(content)
+    except httpx.HTTPStatusError as exc:
+        # A 429 says nothing about response_format support; let the caller back off.
+        if "response_format" in payload and exc.response.status_code != 429:
+            body_preview = _preview_text(exc.response.text)
+            logger.warning(
+                "Local LLM response_format rejected (%s); retrying without response_format.",
+                body_preview,
+            )
+            _mark_json_object_unsupported(base_url)
+            payload.pop("response_format", None)
+            _trace_api_call("[LLM API] retry POST %s without response_format", url)
+            retry = client.post(url, content=orjson.dumps(payload), headers=_JSON_HEADERS, timeout=timeout)
+            retry.raise_for_status()
+            retry_json = orjson.loads(retry.content)
+            content = retry_json["choices"][0]["message"]["content"]
             _trace_api_call(
-                "[LLM API] %s status=%s content_preview=%s",
+                "[LLM API] %s retry_status=%s content_preview=%s",
                 url,
-                response.status_code,
-                _preview_text(content),
+                retry.status_code,
+                _LazyPreview(content),
             )
             return extract_json_from_text(content)
-        except httpx.HTTPStatusError as exc:
-            if "response_format" in payload:
-                body_preview = _preview_text(exc.response.text)
-                logger.warning(
-                    "Local LLM response_format rejected (%s); retrying without response_format.",
-                    body_preview,
-                )
-                _JSON_OBJECT_UNSUPPORTED_BASE_URLS.add(base_url)
-                payload.pop("response_format", None)
-                _trace_api_call("[LLM API] retry POST %s without response_format", url)
-                retry = client.post(url, json=payload)
-                retry.raise_for_status()
-                retry_json = retry.json()
-                content = retry_json["choices"][0]["message"]["content"]
-                _trace_api_call(
-                    "[LLM API] %s retry_status=%s content_preview=%s",
-                    url,
-                    retry.status_code,
-                    _preview_text(content),
-                )
-                return extract_json_from_text(content)
-            raise
+        raise
+
+
+def _get_gemini_client(api_key: str) -> Any:
+    # Shared per key so keep-alive connections (and TLS sessions) survive
+    # across calls instead of handshaking again for every segment.
+    client = _GEMINI_CLIENTS.get(api_key)
+    if client is None:
+        genai, _ = _ensure_genai()
+        client = _GEMINI_CLIENTS.setdefault(api_key, genai.Client(api_key=api_key))
+    return client
+
+
+_JSON_STRUCTURAL_RE = re.compile(r'[\\"{}\[\]]')
+
+
+class _JsonDocumentScanner:
+    """Tracks bracket depth across streamed chunks, scanning each byte once."""
+
+    def __init__(self) -> None:
+        self._offset = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped_pos = -1
+
+    def feed(self, text: str) -> List[int]:
+        """Return buffer offsets just past each bracket that closes the top level."""
+        ends: List[int] = []
+        base = self._offset
+        self._offset += len(text)
+        for match in _JSON_STRUCTURAL_RE.finditer(text):
+            pos = base + match.start()
+            if pos == self._escaped_pos:
+                continue
+            char = match.group()
+            if self._in_string:
+                if char == "\\":
+                    self._escaped_pos = pos + 1
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    ends.append(pos + 1)
+        return ends
+
+
+def _gemini_prompt_cache_name(client: Any, api_key: str, model: str, prompt: str) -> Optional[str]:
+    key = (api_key, model, prompt_fingerprint(prompt))
+    now = time.monotonic()
+    entry = _GEMINI_PROMPT_CACHES.get(key)
+    if entry is not None and now < entry[1]:
+        return entry[0]
+
+    _, types = _ensure_genai()
+    try:
+        cached = client.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                system_instruction=[_system_prompt_part(prompt)],
+                ttl=f"{GEMINI_CONTEXT_CACHE_TTL_SECONDS}s",
+            ),
+        )
+        name = getattr(cached, "name", None)
+        _trace_api_call("[GEMINI] Created context cache %s model=%s.", name, model)
+    except Exception as exc:
+        logger.info("[GEMINI] Context cache unavailable for model=%s; sending prompt inline: %s", model, exc)
+        name = None
+    # Refresh a minute before the server-side copy expires.
+    _GEMINI_PROMPT_CACHES[key] = (name, now + max(GEMINI_CONTEXT_CACHE_TTL_SECONDS - 60, 0))
+    return name
+
+
+@lru_cache(maxsize=2)
+def _gemini_json_options(accumulate_schema: bool = False) -> Dict[str, Any]:
+    # Sampling/format settings shared by every Gemini call. Callers only unpack
+    # the dict, never mutate it.
+    _genai, types = _ensure_genai()
+    options: Dict[str, Any] = dict(
+        temperature=0.65,
+        thinking_config=types.ThinkingConfig(thinking_budget=0),
+        response_mime_type="application/json",
+    )
+    if accumulate_schema:
+        options["response_schema"] = _accumulate_response_schema()
+    return options
+
+
+@lru_cache(maxsize=None)
+def _inline_gemini_config(prompt: str, accumulate_schema: bool = False) -> Any:
+    # Built and validated once per prompt; the SDK doesn't mutate configs it is given.
+    _genai, types = _ensure_genai()
+    return types.GenerateContentConfig(
+        system_instruction=[_system_prompt_part(prompt)], **_gemini_json_options(accumulate_schema)
+    )
+
+
+def _gemini_generate_config(
+    client: Any, api_key: str, model: str, prompt: str, accumulate_schema: bool = False
+) -> Any:
+    """GenerateContentConfig carrying `prompt`, via cached content when available."""
+    _, types = _ensure_genai()
+    cached_name = (
+        _gemini_prompt_cache_name(client, api_key, model, prompt) if GEMINI_CONTEXT_CACHE_ENABLED else None
+    )
+    if cached_name:
+        return types.GenerateContentConfig(cached_content=cached_name, **_gemini_json_options(accumulate_schema))
+    return _inline_gemini_config(prompt, accumulate_schema)
+
+
+def _is_cached_content_gone(exc: BaseException) -> bool:
+    # Gemini reports a deleted cache as "CachedContent not found" (403/404) and a
+    # stale one as a 400 mentioning expiry; other failures leave the cache usable.
+    if _failure_status_code(exc) == 404:
+        return True
+    message = str(exc).lower()
+    return "cache" in message and ("not found" in message or "expired" in message)
+
+
+def _gemini_config_after_failure(
+    config: Any,
+    failure: BaseException,
+    client: Any,
+    api_key: str,
+    model: str,
+    prompt: str,
+    accumulate_schema: bool = False,
+) -> Any:
+    # Only a missing or expired cached prompt is worth recreating (or falling
+    # back to the inline prompt); anything else retries with the same config.
+    if not getattr(config, "cached_content", None) or not _is_cached_content_gone(failure):
+        return config
+    _GEMINI_PROMPT_CACHES.pop((api_key, model, prompt_fingerprint(prompt)), None)
+    return _gemini_generate_config(client, api_key, model, prompt, accumulate_schema)
+
+
+def _stream_gemini_text(client: Any, model: str, contents: List[Any], config: Any) -> str:
+    # Collect streamed pieces and join once instead of re-copying the growing
+    # response on every chunk.
+    parts: List[str] = []
+    scanner = _JsonDocumentScanner()
+    stream = client.models.generate_content_stream(
+        model=model,
+        contents=contents,
+        config=config,
+    )
+    try:
+        for chunk in stream:
+            text = getattr(chunk, "text", None)
+            if not text:
+                continue
+            parts.append(text)
+            ends = scanner.feed(text)
+            if not ends:
+                continue
+            # Brackets balanced: if that prefix is a whole JSON document, stop
+            # now and drop anything the model streams after it.
+            buffered = "".join(parts)
+            for end in ends:
+                candidate = buffered[:end]
+                try:
+                    orjson.loads(candidate)
+                except orjson.JSONDecodeError:
+                    continue
+                return candidate
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+    return "".join(parts)
 
 
 def generate_lct_json_gemini(
@@ -533,6 +1047,10 @@ def generate_lct_json_gemini(
     backoff_base: float = 1.5,
     status_messages: Optional[List[str]] = None,
 ) -> List[Dict[str, Any]]:
+    if _is_trivial_input(transcript):
+        logger.debug("[LCT JSON] Skipping Gemini call for near-empty transcript (%s chars).", len(transcript or ""))
+        return []
+
     resolved_model = str(model_name or GEMINI_MODEL_NAME).strip() or GEMINI_MODEL_NAME
     resolved_key = str(api_key or "").strip()
     if not resolved_key:
@@ -545,12 +1063,23 @@ def generate_lct_json_gemini(
             status_messages.append(message)
         return []
 
-    client = genai.Client(api_key=resolved_key)
+    cache_key = make_cache_key(
+        backend="gemini",
+        model=resolved_model,
+        prompt=prompt_fingerprint(GENERATE_LCT_PROMPT),
+        input=transcript,
+        temperature=0.65,
+    )
+    cached = _LLM_RESPONSE_CACHE.get(cache_key)
+    if cached is not None:
+        _trace_api_call("[GEMINI] Reusing cached graph generation response model=%s.", resolved_model)
+        return _assign_missing_ids(cached)
+
+    _, types = _ensure_genai()
+    client = _get_gemini_client(resolved_key)
     if key_source:
         _trace_api_call("[GEMINI] Using key from %s for graph generation model=%s.", key_source, resolved_model)
 
-    generate_lct_prompt = GENERATE_LCT_PROMPT
-
     contents = [
         types.Content(
             role="user",
@@ -558,30 +1087,22 @@ def generate_lct_json_gemini(
         )
     ]
 
-    config = types.GenerateContentConfig(
-        temperature=0.65,
-        thinking_config=types.ThinkingConfig(thinking_budget=0),
-        response_mime_type="application/json",
-        system_instruction=[types.Part.from_text(text=generate_lct_prompt)],
-    )
+    config = _gemini_generate_config(client, resolved_key, resolved_model, GENERATE_LCT_PROMPT)
 
     last_error: Optional[str] = None
     for attempt in range(retries):
+        failure: Optional[BaseException] = None
+        config_refreshed = False
         full_response = ""
+        _wait_for_rate_limit("gemini")
         try:
-            for chunk in client.models.generate_content_stream(
-                model=resolved_model,
-                contents=contents,
-                config=config,
-            ):
-                if hasattr(chunk, "text"):
-                    full_response += chunk.text
+            full_response = _stream_gemini_text(client, resolved_model, contents, config)
 
             try:
-                parsed = json.loads(full_response)
-                normalized = _normalize_generated_output(parsed)
+                normalized = _normalize_response_text(full_response)
                 if normalized:
-                    return normalized
+                    _LLM_RESPONSE_CACHE.set(cache_key, normalized)
+                    return _assign_missing_ids(normalized)
                 last_error = f"Gemini response decoded but produced no normalized nodes (attempt {attempt + 1})."
                 logger.warning("[LCT JSON] %s", last_error)
             except json.JSONDecodeError as e:
@@ -590,10 +1111,18 @@ def generate_lct_json_gemini(
                 logger.debug("[LCT JSON] Raw Gemini response: %s", full_response)
 
         except Exception as e:
+            failure = e
+            retry_config = _gemini_config_after_failure(
+                config, e, client, resolved_key, resolved_model, GENERATE_LCT_PROMPT
+            )
+            # An expired cached prompt can surface as a client error; the new config may succeed.
+            config_refreshed = retry_config is not config
+            config = retry_config
             last_error = f"Gemini request failed on attempt {attempt + 1}: {e}"
             logger.warning("[LCT JSON] %s", last_error)
 
-        time.sleep(backoff_base ** attempt)
+        if not _backoff_before_retry("gemini", failure, backoff_base, attempt, retries, config_refreshed):
+            break
 
     logger.error("[LCT JSON] All attempts failed, returning empty list.")
     if status_messages is not None and last_error:
@@ -609,6 +1138,10 @@ def genai_accumulate_text_json(
     retries: int = 3,
     backoff_base: float = 1.5,
 ) -> Dict[str, Any]:
+    if _is_trivial_input(input_text):
+        logger.debug("[ACCUMULATE] Skipping Gemini call for near-empty input (%s chars).", len(input_text or ""))
+        return _continue_accumulating_result(input_text)
+
     resolved_model = str(model_name or GEMINI_MODEL_NAME).strip() or GEMINI_MODEL_NAME
     errors: List[str] = []
     resolved_key = str(api_key or "").strip()
@@ -625,64 +1158,70 @@ def genai_accumulate_text_json(
             "_errors": [message],
         }
 
-    system_prompt = ACCUMULATE_SYSTEM_PROMPT
+    cache_key = make_cache_key(
+        backend="gemini",
+        model=resolved_model,
+        prompt=prompt_fingerprint(ACCUMULATE_SYSTEM_PROMPT),
+        input=input_text,
+        temperature=0.65,
+    )
+    cached = _LLM_RESPONSE_CACHE.get(cache_key)
+    if cached is not None:
+        _trace_api_call("[GEMINI] Reusing cached accumulation response model=%s.", resolved_model)
+        return cached
+
+    # Attempt-invariant: build the client, contents and config once for all retries.
+    _, types = _ensure_genai()
+    client = _get_gemini_client(resolved_key)
+    if key_source:
+        _trace_api_call("[GEMINI] Using key from %s for accumulation model=%s.", key_source, resolved_model)
+
+    contents = [
+        types.Content(
+            role="user",
+            parts=[types.Part.from_text(text=input_text)],
+        ),
+    ]
+
+    config = _gemini_generate_config(
+        client, resolved_key, resolved_model, ACCUMULATE_SYSTEM_PROMPT, accumulate_schema=True
+    )
 
     for attempt in range(retries):
+        failure: Optional[BaseException] = None
+        config_refreshed = False
         full_response = ""
+        _wait_for_rate_limit("gemini")
         try:
-            client = genai.Client(api_key=resolved_key)
-            if key_source:
-                _trace_api_call("[GEMINI] Using key from %s for accumulation model=%s.", key_source, resolved_model)
-
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[types.Part.from_text(text=input_text)],
-                ),
-            ]
-
-            config = types.GenerateContentConfig(
-                temperature=0.65,
-                thinking_config=types.ThinkingConfig(thinking_budget=0),
-                response_mime_type="application/json",
-                response_schema=genai.types.Schema(
-                    type=genai.types.Type.OBJECT,
-                    properties={
-                        "decision": genai.types.Schema(type=genai.types.Type.STRING),
-                        "Completed_segment": genai.types.Schema(type=genai.types.Type.STRING),
-                        "Incomplete_segment": genai.types.Schema(type=genai.types.Type.STRING),
-                        "detected_threads": genai.types.Schema(
-                            type=genai.types.Type.ARRAY,
-                            items=genai.types.Schema(type=genai.types.Type.STRING),
-                        ),
-                    },
-                ),
-                system_instruction=[types.Part.from_text(text=system_prompt)],
-            )
-
-            for chunk in client.models.generate_content_stream(
-                model=resolved_model,
-                contents=contents,
-                config=config,
-            ):
-                if hasattr(chunk, "text"):
-                    full_response += str(chunk.text)
+            full_response = _stream_gemini_text(client, resolved_model, contents, config)
 
             try:
-                parsed = json.loads(full_response)
-                if errors:
-                    parsed["_warnings"] = errors
-                return parsed
+                parsed = orjson.loads(full_response)
+                if isinstance(parsed, dict):
+                    _LLM_RESPONSE_CACHE.set(cache_key, parsed)
+                    if errors:
+                        parsed["_warnings"] = errors
+                    return parsed
+                logger.warning("[ACCUMULATE] Gemini response was not a dict; attempt %s", attempt + 1)
+                errors.append(f"Attempt {attempt + 1} returned non-dict payload")
             except json.JSONDecodeError as e:
                 logger.warning("[ACCUMULATE] Attempt %s JSON decode failed: %s", attempt + 1, e)
                 logger.debug("[ACCUMULATE] Raw Gemini response: %s", full_response)
                 errors.append(f"Attempt {attempt + 1} decode failed: {e}")
 
         except Exception as e:
+            failure = e
+            retry_config = _gemini_config_after_failure(
+                config, e, client, resolved_key, resolved_model, ACCUMULATE_SYSTEM_PROMPT, accumulate_schema=True
+            )
+            # An expired cached prompt can surface as a client error; the new config may succeed.
+            config_refreshed = retry_config is not config
+            config = retry_config
             logger.warning("[ACCUMULATE] Attempt %s failed: %s", attempt + 1, e)
             errors.append(f"Attempt {attempt + 1} failed: {e}")
 
-        time.sleep(backoff_base ** attempt)
+        if not _backoff_before_retry("gemini", failure, backoff_base, attempt, retries, config_refreshed):
+            break
 
     logger.error("[ACCUMULATE] All decoding attempts failed - using fallback.")
     return {
@@ -694,6 +1233,17 @@ def genai_accumulate_text_json(
     }
 
 
+def _local_cache_key(settings: _LocalChatSettings, prompt: str, input_text: str) -> str:
+    return make_cache_key(
+        backend="local",
+        base_url=settings.base_url,
+        model=settings.chat_model,
+        prompt=prompt_fingerprint(prompt),
+        input=input_text,
+        temperature=0.65,
+    )
+
+
 def generate_lct_json_local(
     transcript: str,
     llm_config: Optional[Dict[str, Any]] = None,
@@ -701,7 +1251,16 @@ def generate_lct_json_local(
     backoff_base: float = 1.5,
 ) -> List[Dict[str, Any]]:
     config = _resolve_llm_config(llm_config)
+    settings = _local_chat_settings(config)
+    cache_key = _local_cache_key(settings, LOCAL_GENERATE_LCT_PROMPT, transcript)
+    cached = _LLM_RESPONSE_CACHE.get(cache_key)
+    if cached is not None:
+        _trace_api_call("[LLM API] Reusing cached local graph generation response.")
+        return _assign_missing_ids(cached)
+
     for attempt in range(retries):
+        failure: Optional[BaseException] = None
+        _wait_for_rate_limit(settings.base_url)
         try:
             parsed = _call_local_chat_json(
                 prompt=transcript,
@@ -710,17 +1269,20 @@ def generate_lct_json_local(
                 temperature=0.65,
                 max_tokens=4000,
             )
-            normalized = _normalize_generated_output(parsed)
+            normalized = _normalize_generated_output(parsed, assign_ids=False)
             if normalized:
-                return normalized
+                _LLM_RESPONSE_CACHE.set(cache_key, normalized)
+                return _assign_missing_ids(normalized)
             logger.warning(
                 "[LCT JSON] Local response decoded but produced no normalized nodes; attempt %s",
                 attempt + 1,
             )
         except Exception as e:
+            failure = e
             logger.warning("[LCT JSON] Local attempt %s failed: %s", attempt + 1, e)
 
-        time.sleep(backoff_base ** attempt)
+        if not _backoff_before_retry(settings.base_url, failure, backoff_base, attempt, retries):
+            break
 
     logger.error("[LCT JSON] Local attempts exhausted; returning empty list.")
     return []
@@ -733,8 +1295,17 @@ def accumulate_text_json_local(
     backoff_base: float = 1.5,
 ) -> Dict[str, Any]:
     config = _resolve_llm_config(llm_config)
+    settings = _local_chat_settings(config)
+    cache_key = _local_cache_key(settings, ACCUMULATE_SYSTEM_PROMPT, input_text)
+    cached = _LLM_RESPONSE_CACHE.get(cache_key)
+    if cached is not None:
+        _trace_api_call("[LLM API] Reusing cached local accumulation response.")
+        return cached
+
     errors: List[str] = []
     for attempt in range(retries):
+        failure: Optional[BaseException] = None
+        _wait_for_rate_limit(settings.base_url)
         try:
             parsed = _call_local_chat_json(
                 prompt=input_text,
@@ -744,16 +1315,19 @@ def accumulate_text_json_local(
                 max_tokens=1200,
             )
             if isinstance(parsed, dict):
+                _LLM_RESPONSE_CACHE.set(cache_key, parsed)
                 if errors:
                     parsed["_warnings"] = errors
                 return parsed
             logger.warning("[ACCUMULATE] Local response was not a dict; attempt %s", attempt + 1)
             errors.append(f"Attempt {attempt + 1} returned non-dict payload")
         except Exception as e:
+            failure = e
             logger.warning("[ACCUMULATE] Local attempt %s failed: %s", attempt + 1, e)
             errors.append(f"Attempt {attempt + 1} failed: {e}")
 
-        time.sleep(backoff_base ** attempt)
+        if not _backoff_before_retry(settings.base_url, failure, backoff_base, attempt, retries):
+            break
 
     logger.error("[ACCUMULATE] Local attempts exhausted - using fallback.")
     return {
@@ -772,6 +1346,11 @@ def generate_lct_json(
     backoff_base: float = 1.5,
     status_messages: Optional[List[str]] = None,
 ) -> List[Dict[str, Any]]:
+    if _is_trivial_input(transcript):
+        # Nothing to structure; don't spend an LLM call (or a local fallback) on it.
+        logger.debug("[LCT JSON] Skipping generation for near-empty transcript (%s chars).", len(transcript or ""))
+        return []
+
     config = _resolve_llm_config(llm_config)
     if config.get("mode") == "online":
         gemini_key, key_source = _resolve_gemini_api_key()
@@ -812,6 +1391,10 @@ def accumulate_text_json(
     retries: int = 3,
     backoff_base: float = 1.5,
 ) -> Dict[str, Any]:
+    if _is_trivial_input(input_text):
+        logger.debug("[ACCUMULATE] Skipping accumulation for near-empty input (%s chars).", len(input_text or ""))
+        return _continue_accumulating_result(input_text)
+
     config = _resolve_llm_config(llm_config)
     if config.get("mode") == "online":
         gemini_key, key_source = _resolve_gemini_api_key()
@@ -846,6 +1429,29 @@ def accumulate_text_json(
     )
 
 
+def _prompt_node_summary(node: Dict[str, Any]) -> Dict[str, Any]:
+    summary = str(node.get("summary") or "")
+    if len(summary) > PROMPT_NODE_SUMMARY_CHARS:
+        summary = summary[:PROMPT_NODE_SUMMARY_CHARS].rstrip() + "..."
+    return {
+        "node_name": node.get("node_name"),
+        "summary": summary,
+        "predecessor": node.get("predecessor"),
+        "successor": node.get("successor"),
+        "is_bookmark": bool(node.get("is_bookmark")),
+    }
+
+
+def extend_json_array_text(text: str, items: List[Any]) -> str:
+    """Append `items` to `text`, a compact JSON array, without re-serializing it."""
+    if not items:
+        return text
+    added = orjson.dumps(items, default=str).decode("utf-8")
+    if text == "[]":
+        return added
+    return f"{text[:-1]},{added[1:]}"
+
+
 class TranscriptProcessor:
     def __init__(
         self,
@@ -854,17 +1460,59 @@ class TranscriptProcessor:
         batch_size: int = 4,
         max_batch_size: int = 12,
         llm_config: Optional[Dict[str, Any]] = None,
+        max_concurrent_llm: int = 4,
+        batch_growth_factor: float = 1.5,
+        slow_llm_seconds: float = 2.0,
+        enable_speculative_generate: bool = False,
+        debounce_seconds: float = 0.0,
     ) -> None:
         self.accumulator: List[str] = []
+        # " ".join(self.accumulator), kept until the accumulator changes.
+        self._accumulator_text_cache: Optional[str] = None
+        # (input_text, accumulate output) of the last batch the model said to keep
+        # accumulating; the same text re-evaluated would get the same answer.
+        self._last_accumulation: Optional[Tuple[str, Dict[str, Any]]] = None
         self.existing_json: List[Dict[str, Any]] = []
+        # Prompt JSON of the nodes older than the full-detail window, extended as
+        # nodes age out of it.
+        self._older_nodes_text = "[]"
+        self._older_nodes_count = 0
         self.chunk_dict: Dict[str, str] = {}
+        # One urandom read per processor; chunk ids vary only the low bits, so
+        # they stay unique, valid (v4-shaped) UUIDs for anything that parses them.
+        self._chunk_id_base = uuid.uuid4().int
+        self._chunk_counter = itertools.count(1)
         self.base_batch_size = batch_size
         self.max_batch_size = max_batch_size
         self._current_batch_size = batch_size
+        self.batch_growth_factor = batch_growth_factor
+        # When accumulation calls are this slow on average, start batches larger
+        # so each round-trip covers more transcript.
+        self.slow_llm_seconds = slow_llm_seconds
+        self._accumulate_latency_ewma: Optional[float] = None
+        # Start graph generation on the whole batch while the accumulator is still
+        # deciding; wasted (and discarded) when it splits the batch differently.
+        self.enable_speculative_generate = enable_speculative_generate
+        # Once a batch is due, wait this long (from the first due text, not the
+        # latest) so rapid-fire finals join it instead of costing their own call.
+        # Off by default; callers with bursty finals (live STT) opt in.
+        self.debounce_seconds = debounce_seconds
+        self._batch_task: Optional["asyncio.Task[None]"] = None
+        # Graph generation for the latest completed segment. Generations run in
+        # order behind each other (each prompt includes the previous nodes) while
+        # the next batch's accumulate call proceeds.
+        self._generation_tail: Optional["asyncio.Task[None]"] = None
         self._continue_accumulating = True
         self._send_update = send_update
         self._send_status = send_status
         self._llm_config = _resolve_llm_config(llm_config)
+        if self._llm_config.get("mode") == "online":
+            # Both are memoized; resolve them now rather than on the first batch.
+            _resolve_gemini_api_key()
+            _resolve_online_gemini_model(self._llm_config)
+        # LLM calls block on network I/O and retry sleeps, so they run in worker
+        # threads; the semaphore caps how many hit the provider at once.
+        self._llm_semaphore = asyncio.Semaphore(max_concurrent_llm)
 
     async def _emit_status(self, level: str, message: str, context: Optional[Dict[str, Any]] = None) -> None:
         if not self._send_status:
@@ -875,45 +1523,226 @@ class TranscriptProcessor:
         except Exception as exc:
             logger.debug("[PROCESSOR STATUS] failed to send status update: %s", exc)
 
+    def _existing_json_prompt_text(self) -> str:
+        older_count = max(0, len(self.existing_json) - PROMPT_FULL_NODE_COUNT)
+        if PROMPT_SUMMARY_NODE_LIMIT > 0:
+            window = self.existing_json[max(0, older_count - PROMPT_SUMMARY_NODE_LIMIT):older_count]
+            return extend_json_array_text(
+                "[]", [_prompt_node_summary(node) for node in window] + self.existing_json[older_count:]
+            )
+        if older_count < self._older_nodes_count:
+            self._older_nodes_text = "[]"
+            self._older_nodes_count = 0
+        if older_count > self._older_nodes_count:
+            aged_out = self.existing_json[self._older_nodes_count:older_count]
+            self._older_nodes_text = extend_json_array_text(
+                self._older_nodes_text, [_prompt_node_summary(node) for node in aged_out]
+            )
+            self._older_nodes_count = older_count
+        return extend_json_array_text(self._older_nodes_text, self.existing_json[older_count:])
+
     async def handle_final_text(self, final_text: str) -> None:
         if not final_text:
             return
         self.accumulator.append(final_text)
-        if len(self.accumulator) >= self._current_batch_size and self._continue_accumulating:
+        self._accumulator_text_cache = None
+        if not self._batch_due():
+            return
+        if self.debounce_seconds <= 0:
             await self._process_batches()
+        elif self._batch_task is None:
+            self._batch_task = asyncio.create_task(self._run_debounced_batches())
 
     async def flush(self) -> None:
-        if not self.accumulator:
-            return
-        await self._process_batch(self.accumulator, stop_accumulating_flag=True)
-        self.accumulator = []
-        self._current_batch_size = self.base_batch_size
-        self._continue_accumulating = True
+        if self._batch_task is not None:
+            await self._batch_task
+        # Drain what is queued now, one capped batch at a time; finals that
+        # arrive meanwhile wait for the next flush.
+        pending = len(self.accumulator)
+        while pending > 0:
+            batch = self._next_batch()
+            if len(batch) > pending:
+                batch = batch[:pending]
+            await self._process_batch(batch, stop_accumulating_flag=True)
+            self._reset_accumulator([], len(batch))
+            pending -= len(batch)
+            self._current_batch_size = self._initial_batch_size()
+            self._continue_accumulating = True
+        if self._generation_tail is not None:
+            await self._generation_tail
+
+    async def aclose(self) -> None:
+        """Cancel pending batch and graph-generation work (e.g. on disconnect)."""
+        tasks = [task for task in (self._batch_task, self._generation_tail) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._batch_task = None
+        self._generation_tail = None
+
+    def _next_chunk_id(self) -> str:
+        return str(uuid.UUID(int=self._chunk_id_base ^ next(self._chunk_counter)))
+
+    def _next_batch(self) -> List[str]:
+        # Finals can pile up behind a slow LLM call or a debounce window; send
+        # at most one full-size batch and leave the rest for the next round.
+        limit = max(self._current_batch_size, self.max_batch_size)
+        return self.accumulator if len(self.accumulator) <= limit else self.accumulator[:limit]
+
+    def _batch_due(self) -> bool:
+        return len(self.accumulator) >= self._current_batch_size and self._continue_accumulating
+
+    async def _run_debounced_batches(self) -> None:
+        try:
+            await asyncio.sleep(self.debounce_seconds)
+            while self._batch_due():
+                await self._process_batches()
+        except Exception as exc:
+            # Nobody awaits this task, so report here what the caller used to see.
+            logger.exception("[PROCESSOR] Batch processing failed: %s", exc)
+            await self._emit_status(
+                "error",
+                "Failed to process final transcript into graph data.",
+                {"error": str(exc), "stage": "handle_final_text"},
+            )
+        finally:
+            self._batch_task = None
+
+    def _grown_batch_size(self, size: int) -> int:
+        return min(int(size * self.batch_growth_factor) + 1, self.max_batch_size)
+
+    def _initial_batch_size(self) -> int:
+        latency = self._accumulate_latency_ewma
+        if latency is not None and latency > self.slow_llm_seconds:
+            return self._grown_batch_size(self.base_batch_size)
+        return self.base_batch_size
+
+    def _record_accumulate_latency(self, seconds: float) -> None:
+        previous = self._accumulate_latency_ewma
+        self._accumulate_latency_ewma = seconds if previous is None else 0.3 * seconds + 0.7 * previous
+
+    def _accumulator_text(self) -> str:
+        if self._accumulator_text_cache is None:
+            self._accumulator_text_cache = " ".join(self.accumulator)
+        return self._accumulator_text_cache
+
+    def _reset_accumulator(self, parts: List[str], consumed: int) -> None:
+        # Keep final texts that arrived while the first `consumed` were with the LLM.
+        self.accumulator = parts + self.accumulator[consumed:]
+        self._accumulator_text_cache = None
 
     async def _process_batches(self) -> None:
-        continue_accumulating, incomplete_seg = await self._process_batch(self.accumulator)
+        batch = self._next_batch()
+        consumed = len(batch)
+        continue_accumulating, incomplete_seg = await self._process_batch(batch)
 
         if continue_accumulating:
             if self._current_batch_size >= self.max_batch_size:
-                await self._process_batch(self.accumulator, stop_accumulating_flag=True)
-                self.accumulator = []
-                self._current_batch_size = self.base_batch_size
+                batch = self._next_batch()
+                await self._process_batch(batch, stop_accumulating_flag=True)
+                self._reset_accumulator([], len(batch))
+                self._current_batch_size = self._initial_batch_size()
                 self._continue_accumulating = True
             else:
-                self._current_batch_size += self.base_batch_size
+                self._current_batch_size = self._grown_batch_size(self._current_batch_size)
         else:
-            self.accumulator = [incomplete_seg] if incomplete_seg else []
-            self._current_batch_size = self.base_batch_size
+            self._reset_accumulator([incomplete_seg] if incomplete_seg else [], consumed)
+            self._current_batch_size = self._initial_batch_size()
             self._continue_accumulating = True
 
+    async def _generate_graph(
+        self,
+        segment: str,
+        after: Optional["asyncio.Task[None]"] = None,
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        if after is not None:
+            # wait() rather than await: cancelling this call must not cancel `after`.
+            await asyncio.wait({after})
+        mod_input = (
+            f"Existing JSON : \n {self._existing_json_prompt_text()} "
+            f"\n\n Transcript Input: \n {segment}"
+        )
+        status_messages: List[str] = []
+        async with self._llm_semaphore:
+            output_json = await asyncio.to_thread(
+                generate_lct_json,
+                mod_input,
+                llm_config=self._llm_config,
+                status_messages=status_messages,
+            )
+        return output_json, status_messages
+
+    async def _apply_generation(
+        self,
+        segment: str,
+        generation: "asyncio.Task[Tuple[List[Dict[str, Any]], List[str]]]",
+    ) -> None:
+        try:
+            output_json, generation_status_messages = await generation
+            for status_message in generation_status_messages:
+                await self._emit_status(
+                    "warning",
+                    status_message,
+                    {"stage": "generate_lct_json"},
+                )
+
+            if output_json:
+                chunk_id = self._next_chunk_id()
+                self.chunk_dict[chunk_id] = segment
+                for item in output_json:
+                    item["chunk_id"] = chunk_id
+
+                self.existing_json.extend(output_json)
+                await self._send_update(self.existing_json, self.chunk_dict)
+            else:
+                await self._emit_status(
+                    "error",
+                    "LLM returned no structured graph output for a completed transcript segment.",
+                    {
+                        "stage": "generate_lct_json",
+                        "segment_chars": len(segment),
+                    },
+                )
+        except Exception as exc:
+            logger.exception("[PROCESSOR] Graph generation failed: %s", exc)
+            await self._emit_status(
+                "error",
+                "Failed to process final transcript into graph data.",
+                {"error": str(exc), "stage": "generate_lct_json"},
+            )
+
     async def _process_batch(
         self,
         text_batch: List[str],
         stop_accumulating_flag: bool = False,
     ) -> Tuple[bool, str]:
-        input_text = " ".join(text_batch)
-        accumulated_output = accumulate_text_json(input_text, llm_config=self._llm_config)
+        # The accumulator can be evaluated twice in a row (growth cap, flush);
+        # reuse its joined text instead of rebuilding it.
+        input_text = self._accumulator_text() if text_batch is self.accumulator else " ".join(text_batch)
+        previous_generation = self._generation_tail
+        speculative: Optional["asyncio.Task[Tuple[List[Dict[str, Any]], List[str]]]"] = None
+        if stop_accumulating_flag or self.enable_speculative_generate:
+            # A forced flush always generates from the whole input, so that call
+            # can overlap the accumulator; otherwise it's a guess.
+            speculative = asyncio.create_task(self._generate_graph(input_text, after=previous_generation))
+
+        previous = self._last_accumulation
+        reused = previous is not None and previous[0] == input_text
+        if reused:
+            accumulated_output = previous[1]
+        elif not stop_accumulating_flag and len(input_text.strip()) < MIN_ACCUMULATE_CHARS:
+            accumulated_output = _continue_accumulating_result(input_text)
+        else:
+            async with self._llm_semaphore:
+                started = time.monotonic()
+                accumulated_output = await asyncio.to_thread(
+                    accumulate_text_json, input_text, llm_config=self._llm_config
+                )
+                self._record_accumulate_latency(time.monotonic() - started)
+        self._last_accumulation = None
         if not accumulated_output:
+            if speculative is not None:
+                speculative.cancel()
             logger.info("[ACCUMULATE] Empty result; continuing accumulation.")
             await self._emit_status(
                 "warning",
@@ -923,15 +1752,14 @@ class TranscriptProcessor:
             return True, input_text
 
         errors = []
-        if isinstance(accumulated_output, dict):
+        # Attempt errors only feed the status channel; skip them without one.
+        if self._send_status and not reused and isinstance(accumulated_output, dict):
             raw_errors = accumulated_output.get("_errors") or accumulated_output.get("_warnings")
             if isinstance(raw_errors, list):
-                errors = [str(item) for item in raw_errors if str(item).strip()]
+                errors = [text for item in raw_errors if (text := str(item)).strip()]
 
         if errors:
-            summary = errors[0]
-            if len(errors) > 1:
-                summary = f"{summary} (+{len(errors) - 1} more)"
+            summary = errors[0] if len(errors) == 1 else f"{errors[0]} (+{len(errors) - 1} more)"
             await self._emit_status(
                 "warning",
                 summary,
@@ -947,6 +1775,8 @@ class TranscriptProcessor:
         decision_flag = accumulated_output.get("decision", "continue_accumulating")
         if decision_flag == "continue_accumulating":
             decision = True
+            if not stop_accumulating_flag:
+                self._last_accumulation = (input_text, accumulated_output)
         elif decision_flag == "stop_accumulating":
             decision = False
         else:
@@ -958,41 +1788,17 @@ class TranscriptProcessor:
             segmented_input_chunk = input_text
             incomplete_seg = ""
 
+        if speculative is not None and (segmented_input_chunk != input_text or not segmented_input_chunk.strip()):
+            speculative.cancel()
+            speculative = None
+
         if segmented_input_chunk.strip():
-            mod_input = (
-                f"Existing JSON : \n {repr(self.existing_json)} "
-                f"\n\n Transcript Input: \n {segmented_input_chunk}"
-            )
-            generation_status_messages: List[str] = []
-            output_json = generate_lct_json(
-                mod_input,
-                llm_config=self._llm_config,
-                status_messages=generation_status_messages,
+            # Don't wait for the graph: the caller can start the next accumulate
+            # call while this one generates. flush() waits for all of them.
+            generation = speculative or asyncio.create_task(
+                self._generate_graph(segmented_input_chunk, after=previous_generation)
             )
-            for status_message in generation_status_messages:
-                await self._emit_status(
-                    "warning",
-                    status_message,
-                    {"stage": "generate_lct_json"},
-                )
-
-            if output_json:
-                chunk_id = str(uuid.uuid4())
-                self.chunk_dict[chunk_id] = segmented_input_chunk
-                for item in output_json:
-                    item["chunk_id"] = chunk_id
-
-                self.existing_json.extend(output_json)
-                await self._send_update(self.existing_json, self.chunk_dict)
-            else:
-                await self._emit_status(
-                    "error",
-                    "LLM returned no structured graph output for a completed transcript segment.",
-                    {
-                        "stage": "generate_lct_json",
-                        "segment_chars": len(segmented_input_chunk),
-                    },
-                )
+            self._generation_tail = asyncio.create_task(self._apply_generation(segmented_input_chunk, generation))
 
         logger.info("[ACCUMULATE] Evaluated batch of %s transcripts", len(text_batch))
         return decision, incomplete_seg
@@ -1,18 +1,22 @@
 """Speaker-turn synthesis helpers for conversations without analyzed nodes."""
 
+import re
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
 from typing import Dict, List
 
+# ".", "?" or "!" followed by a space or newline: the end of the first sentence.
+_SENTENCE_END_RE = re.compile(r"[.?!][ \n]")
+
 
 def _create_node_label(speaker_name: str, text: str, max_length: int = 60) -> str:
     """Create a concise, meaningful label for a graph node."""
     cleaned_text = text.strip()
 
-    sentence_endings = [". ", "? ", "! ", ".\n", "?\n", "!\n"]
-    first_sentence_end = len(cleaned_text)
-    for ending in sentence_endings:
-        pos = cleaned_text.find(ending)
-        if pos != -1 and pos < first_sentence_end:
-            first_sentence_end = pos + 1
+    # Only a sentence ending before max_length is used, so don't scan past it.
+    match = _SENTENCE_END_RE.search(cleaned_text, 0, max_length)
+    first_sentence_end = match.start() + 1 if match else len(cleaned_text)
 
     if first_sentence_end < max_length:
         summary = cleaned_text[:first_sentence_end].strip()
@@ -21,16 +25,21 @@ def _create_node_label(speaker_name: str, text: str, max_length: int = 60) -> st
     else:
         summary = cleaned_text
 
+    return f"[{_speaker_initials(speaker_name)}] {summary}"
+
+
+@lru_cache(maxsize=256)
+def _speaker_initials(speaker_name: str) -> str:
+    # Speakers repeat across every turn of a conversation.
     speaker_parts = speaker_name.split()
     if len(speaker_parts) >= 2:
-        initials = "".join([part[0].upper() for part in speaker_parts[:2]])
-    else:
-        initials = speaker_name[:2].upper()
-
-    return f"[{initials}] {summary}"
+        return "".join([part[0].upper() for part in speaker_parts[:2]])
+    return speaker_name[:2].upper()
 
 
-def _build_turn_node(current_speaker, current_turn, turn_number: int) -> Dict[str, object]:
+def _build_turn_node(
+    current_speaker, current_turn, turn_number: int, is_last: bool = True
+) -> Dict[str, object]:
     combined_text = "\n".join([utterance.text for utterance in current_turn])
     first_utterance = current_turn[0]
     last_utterance = current_turn[-1]
@@ -48,7 +57,7 @@ def _build_turn_node(current_speaker, current_turn, turn_number: int) -> Dict[st
         "claims": [],
         "key_points": [],
         "predecessor": f"turn_{turn_number - 1}" if turn_number > 1 else None,
-        "successor": None,
+        "successor": None if is_last else f"turn_{turn_number + 1}",
         "contextual_relation": {},
         "linked_nodes": [],
         "is_bookmark": False,
@@ -61,33 +70,8 @@ def _build_turn_node(current_speaker, current_turn, turn_number: int) -> Dict[st
 
 def build_turn_graph_from_utterances(utterances) -> List[Dict[str, object]]:
     """Group utterances by consecutive speaker turns and emit graph nodes."""
-    if not utterances:
-        return []
-
-    current_speaker = None
-    current_turn = []
-    turn_nodes: List[Dict[str, object]] = []
-    turn_number = 0
-
-    for utterance in utterances:
-        if utterance.speaker_id != current_speaker:
-            if current_turn:
-                turn_number += 1
-                turn_node = _build_turn_node(current_speaker, current_turn, turn_number)
-                if turn_nodes:
-                    turn_nodes[-1]["successor"] = turn_node["id"]
-                turn_nodes.append(turn_node)
-
-            current_speaker = utterance.speaker_id
-            current_turn = [utterance]
-        else:
-            current_turn.append(utterance)
-
-    if current_turn:
-        turn_number += 1
-        turn_node = _build_turn_node(current_speaker, current_turn, turn_number)
-        if turn_nodes:
-            turn_nodes[-1]["successor"] = turn_node["id"]
-        turn_nodes.append(turn_node)
-
-    return turn_nodes
+    turns = [(speaker, list(turn)) for speaker, turn in groupby(utterances, key=attrgetter("speaker_id"))]
+    return [
+        _build_turn_node(speaker, turn, turn_number, is_last=turn_number == len(turns))
+        for turn_number, (speaker, turn) in enumerate(turns, start=1)
+    ]
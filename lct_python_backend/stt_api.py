@@ -1,7 +1,6 @@
 """STT settings, telemetry, health, audio upload, and transcript WebSocket endpoints."""
 
 import asyncio
-import json
 import logging
 import os
 import time
@@ -19,6 +18,7 @@ from fastapi import (
     WebSocketDisconnect,
 )
 from fastapi.responses import JSONResponse
+import orjson
 
 from lct_python_backend.db_session import get_async_session, get_async_session_context
 from lct_python_backend.middleware import check_ws_auth
@@ -46,6 +46,8 @@ router = APIRouter()
 RECORDINGS_DIR = os.getenv("AUDIO_RECORDINGS_DIR", "./lct_python_backend/recordings")
 DOWNLOAD_TOKEN = os.getenv("AUDIO_DOWNLOAD_TOKEN")
 STT_DEBUG = os.getenv("STT_DEBUG", "false").lower() in {"1", "true", "yes"}
+# Outbound payloads held per transcript socket before new ones are dropped.
+_WS_SEND_QUEUE_MAXSIZE = 256
 
 audio_storage = AudioStorageManager(RECORDINGS_DIR)
 
@@ -145,14 +147,65 @@ def _ws_is_connected(websocket: WebSocket) -> bool:
         return False
 
 
-async def _safe_send_json(websocket: WebSocket, payload: Dict[str, Any]) -> bool:
-    if not _ws_is_connected(websocket):
-        return False
-    try:
-        await websocket.send_json(payload)
+async def _send_json(websocket: WebSocket, payload: Any) -> None:
+    # Same compact text frame as WebSocket.send_json, encoded with orjson.
+    await websocket.send_text(orjson.dumps(payload).decode("utf-8"))
+
+
+class _FrameWriter:
+    """Sends a WebSocket's outbound payloads from one task, in order.
+
+    Payloads queued while a send is in flight go out together as a single
+    ``{"type": "batch", "items": [...]}`` frame; a lone payload is sent as is.
+    The queue is bounded so a stalled client drops payloads instead of
+    growing memory without limit.
+    """
+
+    def __init__(self, websocket: WebSocket, maxsize: int = _WS_SEND_QUEUE_MAXSIZE) -> None:
+        self._websocket = websocket
+        self._queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(maxsize=maxsize)
+        self._closed = False
+        self.shutdown = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def send(self, payload: Dict[str, Any]) -> bool:
+        if self._closed or self.shutdown.is_set() or not _ws_is_connected(self._websocket):
+            return False
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.debug("[WS] Send queue full; dropping %s payload", payload.get("type"))
+            return False
         return True
-    except (WebSocketDisconnect, RuntimeError):
-        return False
+
+    async def aclose(self) -> None:
+        """Send whatever is already queued, then stop."""
+        if not self._closed:
+            self._closed = True
+            try:
+                self._queue.put_nowait(None)
+            except asyncio.QueueFull:
+                # The writer is busy draining; it stops once the queue is empty.
+                pass
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                while not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                payloads = [payload for payload in batch if payload is not None]
+                if payloads:
+                    frame = payloads[0] if len(payloads) == 1 else {"type": "batch", "items": payloads}
+                    try:
+                        await _send_json(self._websocket, frame)
+                    except (WebSocketDisconnect, RuntimeError):
+                        return
+                if batch[-1] is None or (self._closed and self._queue.empty()):
+                    return
+        finally:
+            self.shutdown.set()
 
 
 # ---------------------------------------------------------------------------
@@ -317,6 +370,7 @@ async def transcripts_websocket(websocket: WebSocket):
         await websocket.close(code=4401, reason="Unauthorized")
         return
     await websocket.accept()
+    writer = _FrameWriter(websocket)
     state = SessionState(metadata={})
     stt_runtime: Optional[RealtimeHttpSttSession] = None
     pending_partial_parts: List[str] = []
@@ -337,12 +391,12 @@ async def transcripts_websocket(websocket: WebSocket):
         task.add_done_callback(background_tasks.discard)
 
     async def _processor_update(existing_json, chunk_dict):
-        await _send_processor_update(websocket, existing_json, chunk_dict)
+        writer.send({"type": "existing_json", "data": existing_json})
+        writer.send({"type": "chunk_dict", "data": chunk_dict})
 
     async with get_async_session_context() as session:
         async def _processor_status(level: str, message: str, context: Dict[str, Any]) -> None:
-            await _safe_send_json(
-                websocket,
+            writer.send(
                 {
                     "type": "processing_status",
                     "level": str(level or "info"),
@@ -356,6 +410,8 @@ async def transcripts_websocket(websocket: WebSocket):
             send_update=_processor_update,
             send_status=_processor_status,
             llm_config=llm_config,
+            # Live STT can emit several finals in quick succession; let them share a batch.
+            debounce_seconds=0.2,
         )
         processor_lock = asyncio.Lock()
         stt_stream_lock = asyncio.Lock()
@@ -378,8 +434,7 @@ async def transcripts_websocket(websocket: WebSocket):
                     await processor.handle_final_text(text)
             except Exception as exc:
                 logger.exception("[WS] Final transcript processing failed: %s", exc)
-                await _safe_send_json(
-                    websocket,
+                writer.send(
                     {
                         "type": "processing_status",
                         "level": "error",
@@ -427,8 +482,7 @@ async def transcripts_websocket(websocket: WebSocket):
                 _track_processor_final_task(asyncio.create_task(_run_processor_final(normalized_text)))
 
             if emit_to_client:
-                await _safe_send_json(
-                    websocket,
+                writer.send(
                     {
                         "type": f"transcript_{event_type}",
                         "text": normalized_text,
@@ -451,8 +505,7 @@ async def transcripts_websocket(websocket: WebSocket):
             if not stt_runtime or not stt_runtime.is_ready():
                 if not stt_unready_notified:
                     stt_unready_notified = True
-                    await _safe_send_json(
-                        websocket,
+                    writer.send(
                         {
                             "type": "stt_provider_error",
                             "detail": (
@@ -468,8 +521,7 @@ async def transcripts_websocket(websocket: WebSocket):
                     partial_result = await stt_runtime.push_audio_chunk(chunk_bytes)
                 except Exception as exc:
                     logger.warning("STT provider request failed: %s", exc)
-                    await _safe_send_json(
-                        websocket,
+                    writer.send(
                         {
                             "type": "stt_provider_error",
                             "detail": f"STT provider request failed: {exc}",
@@ -534,10 +586,18 @@ async def transcripts_websocket(websocket: WebSocket):
                     pending_partial_parts = []
                     pending_partial_chars = 0
 
+        close_code: Optional[int] = None
         try:
             while True:
-                message = await websocket.receive_text()
-                payload = json.loads(message)
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", 1000))
+                audio_frame = message.get("bytes")
+                if audio_frame is not None:
+                    # Binary frames carry raw audio; control messages stay JSON text.
+                    payload = {"type": "audio_chunk"}
+                else:
+                    payload = orjson.loads(message.get("text") or "")
                 msg_type = payload.get("type")
 
                 if msg_type == "session_meta":
@@ -557,7 +617,7 @@ async def transcripts_websocket(websocket: WebSocket):
 
                     conversation_id = payload.get("conversation_id")
                     if not conversation_id:
-                        await websocket.send_json({"type": "error", "detail": "Missing conversation_id"})
+                        writer.send({"type": "error", "detail": "Missing conversation_id"})
                         continue
                     stt_settings: Dict[str, Any] = {}
                     try:
@@ -605,7 +665,7 @@ async def transcripts_websocket(websocket: WebSocket):
                         language=str(stt_settings.get("http_language") or ""),
                     )
 
-                    await websocket.send_json({
+                    writer.send({
                         "type": "session_ack",
                         "conversation_id": conversation_id,
                         "session_id": state.session_id,
@@ -614,17 +674,17 @@ async def transcripts_websocket(websocket: WebSocket):
                         "provider_http_url": provider_http_url or None,
                         "stt_mode": "backend_http",
                         "stt_ready": bool(stt_runtime.is_ready()),
+                        "audio_transport": "binary",
                     })
                     continue
 
                 if msg_type == "audio_chunk":
                     if not state.conversation_id:
-                        await websocket.send_json({"type": "error", "detail": "session_meta must be sent first"})
+                        writer.send({"type": "error", "detail": "session_meta must be sent first"})
                         continue
 
                     if stt_flush_requested:
-                        await _safe_send_json(
-                            websocket,
+                        writer.send(
                             {
                                 "type": "processing_status",
                                 "level": "warning",
@@ -637,16 +697,18 @@ async def transcripts_websocket(websocket: WebSocket):
                     if telemetry_state.get("audio_send_started_at_ms") is None:
                         telemetry_state["audio_send_started_at_ms"] = _now_ms()
 
-                    decode_started_at = time.perf_counter()
-                    try:
-                        chunk_bytes = decode_audio_base64(
-                            payload.get("audio_base64") or payload.get("audio_b64")
-                        )
-                    except ValueError as exc:
-                        await websocket.send_json({"type": "error", "detail": str(exc)})
-                        continue
-
-                    audio_decode_ms = _elapsed_ms(decode_started_at)
+                    if audio_frame is not None:
+                        chunk_bytes, audio_decode_ms = audio_frame, 0.0
+                    else:
+                        decode_started_at = time.perf_counter()
+                        try:
+                            chunk_bytes = decode_audio_base64(
+                                payload.get("audio_base64") or payload.get("audio_b64")
+                            )
+                        except ValueError as exc:
+                            writer.send({"type": "error", "detail": str(exc)})
+                            continue
+                        audio_decode_ms = _elapsed_ms(decode_started_at)
 
                     if not chunk_bytes:
                         continue
@@ -658,7 +720,7 @@ async def transcripts_websocket(websocket: WebSocket):
 
                 if msg_type in {"transcript_partial", "transcript_final"}:
                     if not state.conversation_id:
-                        await websocket.send_json({"type": "error", "detail": "session_meta must be sent first"})
+                        writer.send({"type": "error", "detail": "session_meta must be sent first"})
                         continue
                     text = payload.get("text", "")
                     if not text:
@@ -687,7 +749,7 @@ async def transcripts_websocket(websocket: WebSocket):
                             if _coerce_latency_ms(value) is not None
                         },
                     }
-                    await _safe_send_json(websocket, flush_payload)
+                    writer.send(flush_payload)
 
                     async def _run_post_flush_processing() -> None:
                         nonlocal pending_partial_parts
@@ -710,8 +772,7 @@ async def transcripts_websocket(websocket: WebSocket):
                                     except Exception as exc:
                                         logger.warning("STT provider flush failed: %s", exc)
                                         stt_flush_ms = _elapsed_ms(stt_flush_started_at)
-                                        await _safe_send_json(
-                                            websocket,
+                                        writer.send(
                                             {"type": "stt_provider_error", "detail": f"STT flush failed: {exc}"},
                                         )
                                         final_result = None
@@ -774,7 +835,7 @@ async def transcripts_websocket(websocket: WebSocket):
                                     audio_ready_payload["download_url"] = (
                                         f"/api/conversations/{state.conversation_id}/audio?token={DOWNLOAD_TOKEN}"
                                     )
-                                await _safe_send_json(websocket, audio_ready_payload)
+                                writer.send(audio_ready_payload)
 
                             if pending_processor_final_tasks:
                                 await asyncio.gather(
@@ -787,8 +848,7 @@ async def transcripts_websocket(websocket: WebSocket):
                                 await processor.flush()
                         except Exception as exc:
                             logger.exception("[WS] Processor flush failed: %s", exc)
-                            await _safe_send_json(
-                                websocket,
+                            writer.send(
                                 {
                                     "type": "processing_status",
                                     "level": "error",
@@ -805,7 +865,7 @@ async def transcripts_websocket(websocket: WebSocket):
                     continue
 
                 if msg_type == "ping":
-                    await websocket.send_json({"type": "pong"})
+                    writer.send({"type": "pong"})
                     continue
 
         except WebSocketDisconnect:
@@ -815,39 +875,28 @@ async def transcripts_websocket(websocket: WebSocket):
                 logger.info("[WS] Client disconnected")
             else:
                 logger.exception("[WS] Runtime error in transcript websocket: %s", exc)
-                await _safe_send_json(websocket, {"type": "error", "detail": "Internal server error"})
-                if _ws_is_connected(websocket):
-                    try:
-                        await websocket.close(code=1011)
-                    except RuntimeError:
-                        pass
+                writer.send({"type": "error", "detail": "Internal server error"})
+                close_code = 1011
         except Exception as exc:
             logger.exception("[WS] Error processing transcript websocket: %s", exc)
-            await _safe_send_json(websocket, {"type": "error", "detail": "Internal server error"})
-            if _ws_is_connected(websocket):
+            writer.send({"type": "error", "detail": "Internal server error"})
+            close_code = 1011
+        finally:
+            # Drains anything still queued (including the error above) before closing.
+            await writer.aclose()
+            if close_code is not None and _ws_is_connected(websocket):
                 try:
-                    await websocket.close(code=1011)
+                    await websocket.close(code=close_code)
                 except RuntimeError:
                     pass
-        finally:
             if pending_stt_chunk_tasks:
                 for task in list(pending_stt_chunk_tasks):
                     task.cancel()
                 await asyncio.gather(*list(pending_stt_chunk_tasks), return_exceptions=True)
+            await processor.aclose()
             if stt_runtime:
                 try:
                     await stt_runtime.close()
                 except Exception as exc:
                     logger.debug("[WS] stt_runtime.close() failed: %s", exc)
 
-
-async def _send_processor_update(websocket: WebSocket, existing_json: Any, chunk_dict: Any):
-    try:
-        if websocket.client_state.name != "CONNECTED":
-            return
-        await websocket.send_json({"type": "existing_json", "data": existing_json})
-        await websocket.send_json({"type": "chunk_dict", "data": chunk_dict})
-    except WebSocketDisconnect:
-        logger.info("[WS] Processor update failed - client disconnected")
-    except RuntimeError:
-        logger.info("[WS] Processor update failed - websocket already closed")
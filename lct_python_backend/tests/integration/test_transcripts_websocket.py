@@ -12,6 +12,20 @@ from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 
+class _Inbox:
+    """Reads payloads off the socket, unwrapping coalesced batch frames."""
+
+    def __init__(self, ws):
+        self._ws = ws
+        self._pending = []
+
+    def receive(self):
+        if not self._pending:
+            frame = self._ws.receive_json()
+            self._pending = list(frame["items"]) if frame.get("type") == "batch" else [frame]
+        return self._pending.pop(0)
+
+
 def test_transcripts_ws_persists_partial_and_final(monkeypatch):
     class DummySession:
         async def commit(self):
@@ -57,7 +71,7 @@ def test_transcripts_ws_persists_partial_and_final(monkeypatch):
         persisted.append((event_type, text, payload))
 
     class DummyProcessor:
-        def __init__(self, send_update, llm_config, send_status=None):
+        def __init__(self, send_update, llm_config, send_status=None, **_kwargs):
             self._send_update = send_update
             self._llm_config = llm_config
             self._send_status = send_status
@@ -68,6 +82,9 @@ def test_transcripts_ws_persists_partial_and_final(monkeypatch):
         async def flush(self):
             processor_calls["flush"] += 1
 
+        async def aclose(self):
+            return None
+
     monkeypatch.setattr(stt_api, "persist_transcript_event", AsyncMock(side_effect=fake_persist))
     monkeypatch.setattr(stt_api, "TranscriptProcessor", DummyProcessor)
     monkeypatch.setattr(stt_api, "load_llm_config", AsyncMock(return_value={}))
@@ -80,6 +97,7 @@ def test_transcripts_ws_persists_partial_and_final(monkeypatch):
     conversation_id = str(uuid.uuid4())
 
     with client.websocket_connect("/ws/transcripts") as ws:
+        inbox = _Inbox(ws)
         ws.send_json(
             {
                 "type": "session_meta",
@@ -89,7 +107,7 @@ def test_transcripts_ws_persists_partial_and_final(monkeypatch):
                 "store_audio": False,
             }
         )
-        ack = ws.receive_json()
+        ack = inbox.receive()
         assert ack["type"] == "session_ack"
         assert ack["conversation_id"] == conversation_id
         assert ack["session_id"] == "session-1"
@@ -103,7 +121,7 @@ def test_transcripts_ws_persists_partial_and_final(monkeypatch):
             }
         )
         ws.send_json({"type": "final_flush"})
-        flush_ack = ws.receive_json()
+        flush_ack = inbox.receive()
         assert flush_ack["type"] == "flush_ack"
 
     time.sleep(0.05)
@@ -157,7 +175,7 @@ def test_transcripts_ws_accepts_audio_chunk_backend_owned_stt(monkeypatch):
         persisted.append((event_type, text, payload))
 
     class DummyProcessor:
-        def __init__(self, send_update, llm_config, send_status=None):
+        def __init__(self, send_update, llm_config, send_status=None, **_kwargs):
             self._send_update = send_update
             self._llm_config = llm_config
             self._send_status = send_status
@@ -168,6 +186,9 @@ def test_transcripts_ws_accepts_audio_chunk_backend_owned_stt(monkeypatch):
         async def flush(self):
             processor_calls["flush"] += 1
 
+        async def aclose(self):
+            return None
+
     class DummyHttpSttSession:
         def __init__(self, **_kwargs):
             pass
@@ -210,6 +231,7 @@ def test_transcripts_ws_accepts_audio_chunk_backend_owned_stt(monkeypatch):
     audio_base64 = base64.b64encode(b"\x00\x01\x02\x03").decode("ascii")
 
     with client.websocket_connect("/ws/transcripts") as ws:
+        inbox = _Inbox(ws)
         ws.send_json(
             {
                 "type": "session_meta",
@@ -219,25 +241,162 @@ def test_transcripts_ws_accepts_audio_chunk_backend_owned_stt(monkeypatch):
                 "store_audio": False,
             }
         )
-        ack = ws.receive_json()
+        ack = inbox.receive()
         assert ack["type"] == "session_ack"
         assert ack["stt_mode"] == "backend_http"
         assert ack["stt_ready"] is True
 
         ws.send_json({"type": "audio_chunk", "audio_base64": audio_base64})
 
-        first_msg = ws.receive_json()
-        second_msg = ws.receive_json()
+        first_msg = inbox.receive()
+        second_msg = inbox.receive()
+        assert first_msg["type"] == "transcript_partial"
+        assert second_msg["type"] == "transcript_final"
+        assert "quick transcript" in second_msg["text"]
+
+        ws.send_json({"type": "final_flush"})
+        flush_ack = inbox.receive()
+        assert flush_ack["type"] == "flush_ack"
+
+    time.sleep(0.05)
+    assert [event for event, *_rest in persisted] == ["partial", "final"]
+    assert processor_calls["final"] == ["quick transcript."]
+    assert processor_calls["flush"] == 1
+
+
+def test_transcripts_ws_routes_binary_frames_to_backend_owned_stt(monkeypatch):
+    class DummySession:
+        async def commit(self):
+            return None
+
+    class PlaceholderProcessor:
+        def __init__(self, *args, **kwargs):
+            return None
+
+        async def handle_final_text(self, _text):
+            return None
+
+        async def flush(self):
+            return None
+
+    @asynccontextmanager
+    async def dummy_session_context():
+        yield DummySession()
+
+    async def dummy_get_async_session():
+        yield DummySession()
+
+    dummy_db_session = types.ModuleType("lct_python_backend.db_session")
+    dummy_db_session.get_async_session = dummy_get_async_session
+    dummy_db_session.get_async_session_context = dummy_session_context
+
+    dummy_transcript_processing = types.ModuleType("lct_python_backend.services.transcript_processing")
+    dummy_transcript_processing.TranscriptProcessor = PlaceholderProcessor
+
+    monkeypatch.setitem(sys.modules, "lct_python_backend.db_session", dummy_db_session)
+    monkeypatch.setitem(
+        sys.modules,
+        "lct_python_backend.services.transcript_processing",
+        dummy_transcript_processing,
+    )
+    sys.modules.pop("lct_python_backend.stt_api", None)
+    stt_api = importlib.import_module("lct_python_backend.stt_api")
+
+    persisted = []
+    pushed_chunks = []
+    processor_calls = {"final": [], "flush": 0}
+
+    async def fake_persist(_session, _state, payload, event_type, text):
+        persisted.append((event_type, text, payload))
+
+    class DummyProcessor:
+        def __init__(self, send_update, llm_config, send_status=None, **_kwargs):
+            self._send_update = send_update
+            self._llm_config = llm_config
+            self._send_status = send_status
+
+        async def handle_final_text(self, text):
+            processor_calls["final"].append(text)
+
+        async def flush(self):
+            processor_calls["flush"] += 1
+
+        async def aclose(self):
+            return None
+
+    class DummyHttpSttSession:
+        def __init__(self, **_kwargs):
+            pass
+
+        def is_ready(self):
+            return True
+
+        async def push_audio_chunk(self, chunk):
+            pushed_chunks.append(chunk)
+            return {
+                "text": "quick transcript.",
+                "is_final": False,
+                "metadata": {"provider": "parakeet"},
+            }
+
+        async def flush(self):
+            return None
+
+    monkeypatch.setattr(stt_api, "persist_transcript_event", AsyncMock(side_effect=fake_persist))
+    monkeypatch.setattr(stt_api, "TranscriptProcessor", DummyProcessor)
+    monkeypatch.setattr(stt_api, "RealtimeHttpSttSession", DummyHttpSttSession)
+    monkeypatch.setattr(stt_api, "load_llm_config", AsyncMock(return_value={}))
+    monkeypatch.setattr(
+        stt_api,
+        "_load_stt_settings",
+        AsyncMock(
+            return_value={
+                "provider": "parakeet",
+                "provider_http_urls": {"parakeet": "http://localhost:5092/v1/audio/transcriptions"},
+                "http_url": "http://localhost:5092/v1/audio/transcriptions",
+            }
+        ),
+    )
+    monkeypatch.setattr(stt_api, "get_async_session_context", dummy_session_context)
+
+    app = FastAPI()
+    app.include_router(stt_api.router)
+    client = TestClient(app)
+
+    conversation_id = str(uuid.uuid4())
+
+    with client.websocket_connect("/ws/transcripts") as ws:
+        inbox = _Inbox(ws)
+        ws.send_json(
+            {
+                "type": "session_meta",
+                "conversation_id": conversation_id,
+                "session_id": "session-binary",
+                "provider": "parakeet",
+                "store_audio": False,
+            }
+        )
+        ack = inbox.receive()
+        assert ack["type"] == "session_ack"
+        assert ack["stt_mode"] == "backend_http"
+        assert ack["stt_ready"] is True
+        assert ack["audio_transport"] == "binary"
+
+        ws.send_bytes(b"\x00\x01\x02\x03")
+
+        first_msg = inbox.receive()
+        second_msg = inbox.receive()
         assert first_msg["type"] == "transcript_partial"
         assert second_msg["type"] == "transcript_final"
         assert "quick transcript" in second_msg["text"]
 
         ws.send_json({"type": "final_flush"})
-        flush_ack = ws.receive_json()
+        flush_ack = inbox.receive()
         assert flush_ack["type"] == "flush_ack"
 
     time.sleep(0.05)
     assert [event for event, *_rest in persisted] == ["partial", "final"]
+    assert pushed_chunks == [b"\x00\x01\x02\x03"]
     assert processor_calls["final"] == ["quick transcript."]
     assert processor_calls["flush"] == 1
 
@@ -284,7 +443,7 @@ def test_transcripts_ws_flush_ack_not_blocked_by_processor_flush(monkeypatch):
         return None
 
     class SlowFlushProcessor:
-        def __init__(self, send_update, llm_config, send_status=None):
+        def __init__(self, send_update, llm_config, send_status=None, **_kwargs):
             self._send_update = send_update
             self._llm_config = llm_config
             self._send_status = send_status
@@ -295,6 +454,9 @@ def test_transcripts_ws_flush_ack_not_blocked_by_processor_flush(monkeypatch):
         async def flush(self):
             await asyncio.sleep(0.35)
 
+        async def aclose(self):
+            return None
+
     monkeypatch.setattr(stt_api, "persist_transcript_event", AsyncMock(side_effect=fake_persist))
     monkeypatch.setattr(stt_api, "TranscriptProcessor", SlowFlushProcessor)
     monkeypatch.setattr(stt_api, "load_llm_config", AsyncMock(return_value={}))
@@ -307,6 +469,7 @@ def test_transcripts_ws_flush_ack_not_blocked_by_processor_flush(monkeypatch):
     conversation_id = str(uuid.uuid4())
 
     with client.websocket_connect("/ws/transcripts") as ws:
+        inbox = _Inbox(ws)
         ws.send_json(
             {
                 "type": "session_meta",
@@ -316,13 +479,13 @@ def test_transcripts_ws_flush_ack_not_blocked_by_processor_flush(monkeypatch):
                 "store_audio": False,
             }
         )
-        ack = ws.receive_json()
+        ack = inbox.receive()
         assert ack["type"] == "session_ack"
 
         ws.send_json({"type": "transcript_final", "text": "quick final segment"})
         start = time.perf_counter()
         ws.send_json({"type": "final_flush"})
-        flush_ack = ws.receive_json()
+        flush_ack = inbox.receive()
         elapsed_ms = (time.perf_counter() - start) * 1000.0
         assert flush_ack["type"] == "flush_ack"
         assert elapsed_ms < 250.0
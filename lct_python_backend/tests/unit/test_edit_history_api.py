@@ -0,0 +1,66 @@
+from contextlib import asynccontextmanager
+import uuid
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from lct_python_backend import edit_history_api
+
+
+def _client(monkeypatch, stream):
+    sessions = {"opened": 0, "closed": 0}
+
+    class FakeDb:
+        @asynccontextmanager
+        async def session(self):
+            sessions["opened"] += 1
+            try:
+                yield object()
+            finally:
+                sessions["closed"] += 1
+
+    monkeypatch.setattr(edit_history_api, "db", FakeDb())
+    monkeypatch.setattr(edit_history_api.TrainingDataExporter, "stream_conversation_edits", stream)
+    app = FastAPI()
+    app.include_router(edit_history_api.router)
+    return TestClient(app), sessions
+
+
+def test_export_training_data_reports_query_failure_as_500(monkeypatch):
+    async def failing_stream(self, conversation_id, **kwargs):
+        raise RuntimeError("database unavailable")
+        yield b""
+
+    client, sessions = _client(monkeypatch, failing_stream)
+
+    response = client.get(f"/api/conversations/{uuid.uuid4()}/training-data?format=csv")
+
+    assert response.status_code == 500
+    assert "database unavailable" in response.json()["detail"]
+    assert sessions == {"opened": 1, "closed": 1}
+
+
+def test_export_training_data_streams_chunks_and_closes_session(monkeypatch):
+    async def stream(self, conversation_id, **kwargs):
+        yield b"header\n"
+        yield b"row\n"
+
+    client, sessions = _client(monkeypatch, stream)
+
+    response = client.get(f"/api/conversations/{uuid.uuid4()}/training-data?format=csv")
+
+    assert response.status_code == 200
+    assert response.content == b"header\nrow\n"
+    assert response.headers["content-disposition"].startswith("attachment; filename=training_")
+    assert sessions == {"opened": 1, "closed": 1}
+
+
+def test_export_training_data_rejects_bad_parameters_before_querying(monkeypatch):
+    async def stream(self, conversation_id, **kwargs):
+        yield b""
+
+    client, sessions = _client(monkeypatch, stream)
+
+    assert client.get("/api/conversations/not-a-uuid/training-data").status_code == 400
+    assert client.get(f"/api/conversations/{uuid.uuid4()}/training-data?format=xml").status_code == 400
+    assert sessions["opened"] == 0
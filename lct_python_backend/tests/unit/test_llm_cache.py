@@ -0,0 +1,54 @@
+from lct_python_backend.services import llm_cache as llm_cache_module
+from lct_python_backend.services.llm_cache import LLMCache, make_cache_key, prompt_fingerprint
+
+
+def test_make_cache_key_is_order_independent_and_input_sensitive():
+    assert make_cache_key(model="m", input="a") == make_cache_key(input="a", model="m")
+    assert make_cache_key(model="m", input="a") != make_cache_key(model="m", input="b")
+
+
+def test_prompt_fingerprint_changes_with_prompt_text():
+    assert prompt_fingerprint("system prompt") == prompt_fingerprint("system prompt")
+    assert prompt_fingerprint("system prompt") != prompt_fingerprint("system prompt v2")
+    assert len(prompt_fingerprint("system prompt")) == 16
+
+
+def test_llm_cache_returns_copies_and_tracks_stats():
+    cache = LLMCache(maxsize=4, ttl_seconds=60)
+    cache.set("k", {"nodes": ["a"]})
+
+    first = cache.get("k")
+    first["nodes"].append("mutated")
+
+    assert cache.get("k") == {"nodes": ["a"]}
+    assert cache.get("missing") is None
+    assert cache.stats == {"hits": 2, "misses": 1}
+
+
+def test_llm_cache_evicts_least_recently_used():
+    cache = LLMCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_llm_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(llm_cache_module.time, "monotonic", lambda: now[0])
+    cache = LLMCache(maxsize=2, ttl_seconds=10)
+    cache.set("a", 1)
+
+    now[0] += 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_llm_cache_disabled_with_zero_size():
+    cache = LLMCache(maxsize=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
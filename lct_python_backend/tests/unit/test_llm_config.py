@@ -8,6 +8,7 @@ def test_env_llm_defaults(monkeypatch):
     monkeypatch.setenv("LOCAL_LLM_EMBEDDING_MODEL", "embed-model")
     monkeypatch.setenv("LOCAL_LLM_JSON_MODE", "false")
     monkeypatch.setenv("LOCAL_LLM_TIMEOUT_SECONDS", "45")
+    monkeypatch.setenv("LOCAL_LLM_CACHE_PROMPT", "true")
 
     defaults = get_env_llm_defaults()
 
@@ -17,15 +18,17 @@ def test_env_llm_defaults(monkeypatch):
     assert defaults["embedding_model"] == "embed-model"
     assert defaults["json_mode"] is False
     assert defaults["timeout_seconds"] == 45.0
+    assert defaults["cache_prompt"] is True
 
 
 def test_merge_llm_config_sanitizes_mode(monkeypatch):
     monkeypatch.setenv("DEFAULT_LLM_MODE", "local")
 
-    merged = merge_llm_config({"mode": "invalid", "json_mode": "0"})
+    merged = merge_llm_config({"mode": "invalid", "json_mode": "0", "cache_prompt": "yes"})
 
     assert merged["mode"] == "local"
     assert merged["json_mode"] is False
+    assert merged["cache_prompt"] is True
 
 
 def test_merge_llm_config_rewrites_localhost_lmstudio_to_tailscale(monkeypatch):
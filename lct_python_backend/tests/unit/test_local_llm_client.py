@@ -20,3 +20,15 @@ def test_extract_json_from_text_handles_trailing_non_json_text():
 def test_extract_json_from_text_raises_on_missing_json():
     with pytest.raises(Exception):
         extract_json_from_text("<think>only reasoning without payload</think>")
+
+
+def test_extract_json_from_text_handles_fenced_and_non_standard_json():
+    assert extract_json_from_text('```json\n{"a": [1, 2]}\n```') == {"a": [1, 2]}
+    # orjson rejects NaN; the stdlib fallback still recovers the payload.
+    parsed = extract_json_from_text('{"score": NaN}')
+    assert parsed["score"] != parsed["score"]
+
+
+def test_extract_json_from_text_keeps_valid_json_verbatim():
+    payload = '{"summary": "mentions <think>tags</think> literally"}'
+    assert extract_json_from_text(payload) == {"summary": "mentions <think>tags</think> literally"}
@@ -1,6 +1,8 @@
 from contextlib import asynccontextmanager
+import asyncio
 from datetime import datetime, timedelta
 import importlib
+import json
 import sys
 from types import SimpleNamespace
 import types
@@ -258,3 +260,73 @@ def test_health_check_endpoint_requires_provider_or_http_url(monkeypatch):
     response = client.post("/api/settings/stt/health-check", json={"provider": "parakeet"})
     assert response.status_code == 400
     assert "No STT URL configured" in response.json()["detail"]
+
+
+def test_frame_writer_batches_payloads_queued_behind_a_send(monkeypatch):
+    stt_api = _load_stt_api_with_stubs(monkeypatch)
+
+    class SlowWebSocket:
+        client_state = SimpleNamespace(name="CONNECTED")
+
+        def __init__(self):
+            self.frames = []
+            self.release = asyncio.Event()
+
+        async def send_text(self, text):
+            if not self.frames:
+                await self.release.wait()
+            self.frames.append(json.loads(text))
+
+    async def run():
+        websocket = SlowWebSocket()
+        writer = stt_api._FrameWriter(websocket)
+        assert writer.send({"type": "transcript_partial", "text": "a"})
+        await asyncio.sleep(0)
+        writer.send({"type": "transcript_partial", "text": "ab"})
+        writer.send({"type": "transcript_final", "text": "abc"})
+        websocket.release.set()
+        await writer.aclose()
+        assert not writer.send({"type": "error"})
+        return websocket.frames
+
+    frames = asyncio.run(run())
+    assert frames == [
+        {"type": "transcript_partial", "text": "a"},
+        {
+            "type": "batch",
+            "items": [
+                {"type": "transcript_partial", "text": "ab"},
+                {"type": "transcript_final", "text": "abc"},
+            ],
+        },
+    ]
+
+
+def test_frame_writer_drops_payloads_when_queue_is_full_and_stops_on_send_error(monkeypatch):
+    stt_api = _load_stt_api_with_stubs(monkeypatch)
+
+    class StalledWebSocket:
+        client_state = SimpleNamespace(name="CONNECTED")
+
+        def __init__(self):
+            self.release = asyncio.Event()
+
+        async def send_text(self, _text):
+            await self.release.wait()
+            raise RuntimeError("WebSocket is not connected")
+
+    async def run():
+        websocket = StalledWebSocket()
+        writer = stt_api._FrameWriter(websocket, maxsize=2)
+        assert writer.send({"type": "transcript_partial", "text": "a"})
+        await asyncio.sleep(0)
+        assert writer.send({"type": "transcript_partial", "text": "ab"})
+        assert writer.send({"type": "transcript_partial", "text": "abc"})
+        assert not writer.send({"type": "transcript_partial", "text": "abcd"})
+
+        websocket.release.set()
+        await asyncio.wait_for(writer.shutdown.wait(), timeout=1.0)
+        assert not writer.send({"type": "transcript_final", "text": "abcd"})
+        await asyncio.wait_for(writer.aclose(), timeout=1.0)
+
+    asyncio.run(run())
@@ -0,0 +1,62 @@
+import asyncio
+
+from lct_python_backend.services import stt_settings_service
+
+
+class _Result:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar_one_or_none(self):
+        return self._value
+
+
+class _CountingSession:
+    def __init__(self):
+        self.executes = 0
+        self.commits = 0
+        self.added = []
+
+    async def execute(self, _statement):
+        self.executes += 1
+        return _Result(self.added[-1] if self.added else None)
+
+    def add(self, row):
+        self.added.append(row)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def test_load_stt_settings_is_cached_until_save(monkeypatch):
+    monkeypatch.setattr(stt_settings_service, "_settings_cache", None)
+    session = _CountingSession()
+
+    async def run():
+        first = await stt_settings_service.load_stt_settings(session)
+        first["provider"] = "mutated"
+        second = await stt_settings_service.load_stt_settings(session)
+        assert session.executes == 1
+        assert second["provider"] != "mutated"
+
+        await stt_settings_service.save_stt_settings(session, {"provider": "whisper"})
+        reloaded = await stt_settings_service.load_stt_settings(session)
+        assert reloaded["provider"] == "whisper"
+        assert session.executes == 3
+
+    asyncio.run(run())
+
+
+def test_load_stt_settings_reloads_after_ttl(monkeypatch):
+    monkeypatch.setattr(stt_settings_service, "_settings_cache", None)
+    now = [100.0]
+    monkeypatch.setattr(stt_settings_service.time, "monotonic", lambda: now[0])
+    session = _CountingSession()
+
+    async def run():
+        await stt_settings_service.load_stt_settings(session)
+        now[0] += stt_settings_service.STT_SETTINGS_CACHE_TTL_SECONDS + 1
+        await stt_settings_service.load_stt_settings(session)
+        assert session.executes == 2
+
+    asyncio.run(run())
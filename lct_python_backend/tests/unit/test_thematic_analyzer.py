@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+import uuid
+
+import pytest
+
+from lct_python_backend.services.thematic_analyzer import ThematicAnalyzer
+
+
+class _FakeSession:
+    def __init__(self):
+        self.added = []
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def flush(self):
+        return None
+
+    async def commit(self):
+        return None
+
+
+def _utterance(sequence_number, start, end):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        sequence_number=sequence_number,
+        timestamp_start=start,
+        timestamp_end=end,
+    )
+
+
+@pytest.mark.asyncio
+async def test_save_thematic_structure_derives_timestamps_from_cited_utterances():
+    db = _FakeSession()
+    analyzer = ThematicAnalyzer(db)
+    utterances = [
+        _utterance(0, 0.0, 4.5),
+        _utterance(1, 4.5, 9.0),
+        _utterance(2, 9.0, 15.25),
+    ]
+    structure = {
+        "thematic_nodes": [
+            {
+                "label": "Intro",
+                "summary": "Opening remarks",
+                "utterance_sequence_numbers": [2, 1, 99],
+                "node_type": "discussion",
+                "timestamp_start": 999,
+                "timestamp_end": 1000,
+            }
+        ],
+        "edges": [],
+    }
+
+    result = await analyzer._save_thematic_structure(str(uuid.uuid4()), utterances, structure)
+
+    theme = result["thematic_nodes"][0]
+    assert theme["timestamp_start"] == 4.5
+    assert theme["timestamp_end"] == 15.25
+    assert db.added[0].duration_seconds == pytest.approx(10.75)
+
+
+@pytest.mark.asyncio
+async def test_save_thematic_structure_leaves_timestamps_empty_when_unknown():
+    db = _FakeSession()
+    analyzer = ThematicAnalyzer(db)
+    utterances = [_utterance(0, None, None)]
+    structure = {
+        "thematic_nodes": [
+            {
+                "label": "Untimed",
+                "summary": "No timing info",
+                "utterance_sequence_numbers": [0],
+                "node_type": "discussion",
+            }
+        ],
+        "edges": [],
+    }
+
+    result = await analyzer._save_thematic_structure(str(uuid.uuid4()), utterances, structure)
+
+    theme = result["thematic_nodes"][0]
+    assert theme["timestamp_start"] is None
+    assert theme["timestamp_end"] is None
+    assert db.added[0].duration_seconds is None
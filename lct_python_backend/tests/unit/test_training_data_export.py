@@ -0,0 +1,255 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import json
+import uuid
+
+import pytest
+
+from lct_python_backend.services import training_data_export
+from lct_python_backend.services.training_data_export import TrainingDataExporter
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def all(self):
+        return list(self._rows)
+
+
+class _FakeStreamResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    async def __aiter__(self):
+        for row in self._rows:
+            yield row
+
+
+class _FakeSession:
+    """Serves `rows` from stream() (edits query) and `node_rows` from execute()."""
+
+    def __init__(self, rows, node_rows=()):
+        self._rows = rows
+        self._node_rows = list(node_rows)
+        self.execute_calls = 0
+        self.stream_calls = 0
+        self.stream_queries = []
+
+    async def execute(self, _query):
+        self.execute_calls += 1
+        return _FakeResult(self._node_rows)
+
+    async def stream(self, query):
+        self.stream_calls += 1
+        self.stream_queries.append(query)
+        return _FakeStreamResult(self._rows)
+
+
+async def _collect(chunks):
+    return b"".join([chunk async for chunk in chunks]).decode("utf-8")
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+def _edit(target_type, target_id=None, **overrides):
+    fields = dict(
+        id=uuid.uuid4(),
+        target_type=target_type,
+        target_id=target_id or uuid.uuid4(),
+        field_name="summary",
+        old_value="old",
+        new_value="new",
+        edit_type="correction",
+        user_id="tester",
+        user_comment=None,
+        user_confidence=1.0,
+        exported_for_training=False,
+        training_dataset_id=None,
+        created_at=datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    )
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def _rows(conv_name, edits):
+    rows = [SimpleNamespace(**vars(edit), conversation_name=conv_name) for edit in edits]
+    return rows or [SimpleNamespace(id=None, conversation_name=conv_name)]
+
+
+@pytest.mark.asyncio
+async def test_export_jsonl_uses_prefetched_node_contexts():
+    node_id = uuid.uuid4()
+    node_row = SimpleNamespace(id=node_id, node_name="Node", summary="Node summary", key_points=None)
+    edits = [_edit("node", node_id), _edit("node", node_id), _edit("relationship")]
+    db = _FakeSession(_rows("Conversation", edits), node_rows=[node_row])
+    exporter = TrainingDataExporter(db)
+
+    output = await exporter.export_conversation_edits(str(uuid.uuid4()), format="jsonl")
+
+    # One node-context query plus one streamed edits query, regardless of edit count
+    assert db.execute_calls == 1
+    assert db.stream_calls == 1
+    examples = [json.loads(line) for line in output.splitlines()]
+    assert len(examples) == 3
+    assert [m["role"] for m in examples[0]["messages"]] == ["system", "user", "assistant"]
+    assert examples[0]["messages"][1]["content"].startswith("Context: Node summary")
+    assert examples[2]["messages"][1]["content"] == "Original summary: old"
+    assert examples[0]["metadata"]["conversation_name"] == "Conversation"
+
+
+@pytest.mark.asyncio
+async def test_export_jsonl_skips_node_context_query_when_not_requested():
+    node_id = uuid.uuid4()
+    node_row = SimpleNamespace(id=node_id, node_name="Node", summary="Node summary", key_points=None)
+    db = _FakeSession(_rows("Conversation", [_edit("node", node_id)]), node_rows=[node_row])
+    exporter = TrainingDataExporter(db)
+
+    output = await exporter.export_conversation_edits(
+        str(uuid.uuid4()), format="jsonl", include_node_context=False
+    )
+
+    assert db.execute_calls == 0
+    assert json.loads(output)["messages"][1]["content"] == "Original summary: old"
+
+
+@pytest.mark.asyncio
+async def test_export_jsonl_without_node_context():
+    exporter = TrainingDataExporter(_FakeSession([]))
+
+    output = await _collect(
+        exporter._export_jsonl(_aiter([_edit("relationship")]), "conv-1", "Conversation", {})
+    )
+
+    example = json.loads(output)
+    assert example["messages"][1]["content"] == "Original summary: old"
+
+
+@pytest.mark.asyncio
+async def test_export_jsonl_writes_non_ascii_text_as_raw_utf8():
+    edit = _edit("relationship", old_value="café", new_value="日本語 ✓")
+    exporter = TrainingDataExporter(_FakeSession([]))
+
+    chunks = [
+        chunk async for chunk in exporter._export_jsonl(_aiter([edit]), "conv-1", "Rückblick", {})
+    ]
+
+    line = chunks[0]
+    assert line.endswith(b"\n")
+    assert "日本語 ✓".encode("utf-8") in line
+    assert b"\\u" not in line
+    example = json.loads(line)
+    assert example["messages"][1]["content"] == "Original summary: café"
+    assert example["messages"][2]["content"] == "Corrected summary: 日本語 ✓"
+    assert example["metadata"]["conversation_name"] == "Rückblick"
+
+
+@pytest.mark.asyncio
+async def test_export_conversation_edits_reads_name_and_edits_from_one_query():
+    edits = [_edit("relationship"), _edit("relationship")]
+    db = _FakeSession(_rows("Conversation", edits))
+    exporter = TrainingDataExporter(db)
+
+    output = await exporter.export_conversation_edits(str(uuid.uuid4()), format="csv")
+
+    assert db.execute_calls == 0
+    assert db.stream_calls == 1
+    lines = output.strip().splitlines()
+    assert len(lines) == 3
+    assert "Conversation" in lines[1]
+
+
+@pytest.mark.asyncio
+async def test_export_conversation_edits_keeps_name_without_edits():
+    db = _FakeSession(_rows("Conversation", []))
+    exporter = TrainingDataExporter(db)
+
+    output = await exporter.export_conversation_edits(str(uuid.uuid4()), format="markdown")
+
+    assert output.startswith("# Edit History: Conversation")
+    assert "**Total Edits:** 0" in output
+
+
+@pytest.mark.asyncio
+async def test_export_markdown_counts_streamed_edits_in_footer():
+    edits = [_edit("relationship"), _edit("node")]
+    db = _FakeSession(_rows("Conversation", edits))
+    exporter = TrainingDataExporter(db)
+
+    output = await exporter.export_conversation_edits(str(uuid.uuid4()), format="markdown")
+
+    assert "## Edit 2: summary" in output
+    assert output.rstrip().endswith("**Total Edits:** 2")
+
+
+@pytest.mark.asyncio
+async def test_stream_conversation_edits_yields_csv_in_batches(monkeypatch):
+    monkeypatch.setattr(training_data_export, "CSV_BATCH_SIZE", 2)
+    edits = [_edit("relationship") for _ in range(5)]
+    db = _FakeSession(_rows("Conversation", edits))
+    exporter = TrainingDataExporter(db)
+
+    chunks = [
+        chunk.decode("utf-8")
+        async for chunk in exporter.stream_conversation_edits(str(uuid.uuid4()), format="csv")
+    ]
+
+    # Header chunk + batches of 2, 2 and 1 rows
+    assert chunks[0].startswith("edit_id,conversation_id")
+    assert [len(chunk.splitlines()) for chunk in chunks[1:]] == [2, 2, 1]
+    assert str(edits[4].id) in chunks[3]
+
+
+@pytest.mark.asyncio
+async def test_export_conversation_edits_rejects_unknown_format():
+    exporter = TrainingDataExporter(_FakeSession([]))
+
+    with pytest.raises(ValueError):
+        await exporter.export_conversation_edits(str(uuid.uuid4()), format="xml")
+
+
+@pytest.mark.asyncio
+async def test_export_csv_streams_utf8_bytes():
+    edit = _edit("relationship", new_value='café, "quoted"')
+    db = _FakeSession(_rows("Conversation", [edit]))
+    exporter = TrainingDataExporter(db)
+
+    chunks = [chunk async for chunk in exporter.stream_conversation_edits(str(uuid.uuid4()), format="csv")]
+
+    assert all(isinstance(chunk, bytes) for chunk in chunks)
+    assert '"café, ""quoted"""'.encode("utf-8") in b"".join(chunks)
+
+
+@pytest.mark.asyncio
+async def test_export_conversation_edits_applies_since_and_limit():
+    db = _FakeSession(_rows("Conversation", [_edit("relationship")]))
+    exporter = TrainingDataExporter(db)
+    since = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    await exporter.export_conversation_edits(str(uuid.uuid4()), format="csv", since=since, limit=50)
+
+    sql = str(db.stream_queries[0])
+    assert "edits_log.created_at > :created_at_1" in sql
+    assert "ORDER BY edits_log.created_at, edits_log.id" in sql
+    assert "LIMIT :param_1" in sql
+
+
+@pytest.mark.asyncio
+async def test_export_conversation_edits_skips_conversation_join_when_name_known():
+    edits = [_edit("relationship"), _edit("relationship")]
+    db = _FakeSession(edits)
+    exporter = TrainingDataExporter(db)
+
+    output = await exporter.export_conversation_edits(
+        str(uuid.uuid4()), format="markdown", conv_name="Known"
+    )
+
+    assert "conversations" not in str(db.stream_queries[0])
+    assert output.startswith("# Edit History: Known")
+    assert "**Total Edits:** 2" in output
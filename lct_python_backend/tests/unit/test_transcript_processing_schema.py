@@ -1,7 +1,24 @@
+from types import SimpleNamespace
+import asyncio
+import json
+import threading
+import uuid
+
+import httpx
+import pytest
+
 from lct_python_backend.services import transcript_processing as transcript_processing_module
+from lct_python_backend.services.llm_cache import LLMCache
 from lct_python_backend.services.transcript_processing import _normalize_generated_output
 
 
+@pytest.fixture(autouse=True)
+def _fresh_gemini_key_cache():
+    transcript_processing_module._resolve_gemini_api_key_cached.cache_clear()
+    yield
+    transcript_processing_module._resolve_gemini_api_key_cached.cache_clear()
+
+
 def test_normalize_generated_output_accepts_nodes_and_edges_object():
     parsed = {
         "nodes": [
@@ -154,3 +171,900 @@ def test_generate_lct_json_online_passes_selected_gemini_model(monkeypatch):
 
     assert result[0]["node_name"] == "gemini-node"
     assert captured["model_name"] == "gemini-3-flash-preview"
+
+
+class _FakeGeminiModels:
+    def __init__(self, response_text):
+        self.response_text = response_text
+        self.calls = 0
+
+    def generate_content_stream(self, **kwargs):
+        self.calls += 1
+        yield SimpleNamespace(text=self.response_text)
+
+
+def _install_fake_gemini(monkeypatch, response_text):
+    models = _FakeGeminiModels(response_text)
+    genai, types = transcript_processing_module._ensure_genai()
+    fake_genai = SimpleNamespace(Client=lambda api_key: SimpleNamespace(models=models), types=genai.types)
+    monkeypatch.setattr(transcript_processing_module, "_ensure_genai", lambda: (fake_genai, types))
+    monkeypatch.setattr(transcript_processing_module, "_GEMINI_CLIENTS", {})
+    monkeypatch.setattr(transcript_processing_module, "_LLM_RESPONSE_CACHE", LLMCache())
+    return models
+
+
+def test_generate_lct_json_gemini_reuses_cached_response(monkeypatch):
+    models = _install_fake_gemini(
+        monkeypatch, json.dumps([{"node_name": "Launch Timeline", "summary": "Ship Friday."}])
+    )
+
+    first = transcript_processing_module.generate_lct_json_gemini("Transcript", api_key="key")
+    first[0]["chunk_id"] = "mutated-by-caller"
+    second = transcript_processing_module.generate_lct_json_gemini("Transcript", api_key="key")
+
+    assert models.calls == 1
+    assert second[0]["node_name"] == "Launch Timeline"
+    assert second[0]["chunk_id"] is None
+
+    transcript_processing_module.generate_lct_json_gemini("Other transcript", api_key="key")
+    assert models.calls == 2
+
+
+def test_genai_accumulate_text_json_reuses_cached_response(monkeypatch):
+    models = _install_fake_gemini(
+        monkeypatch,
+        json.dumps({"decision": "stop_accumulating", "Completed_segment": "a", "Incomplete_segment": "b"}),
+    )
+
+    first = transcript_processing_module.genai_accumulate_text_json("hello", api_key="key")
+    second = transcript_processing_module.genai_accumulate_text_json("hello", api_key="key")
+
+    assert models.calls == 1
+    assert first == second
+    assert second["decision"] == "stop_accumulating"
+
+
+def test_genai_accumulate_text_json_does_not_cache_non_dict_response(monkeypatch):
+    models = _install_fake_gemini(monkeypatch, json.dumps(["not", "a", "dict"]))
+    monkeypatch.setattr(transcript_processing_module, "_retry_delay", lambda *args: 0)
+
+    result = transcript_processing_module.genai_accumulate_text_json("hello", api_key="key", retries=2)
+
+    assert result["decision"] == "continue_accumulating"
+    assert models.calls == 2
+    assert len(transcript_processing_module._LLM_RESPONSE_CACHE) == 0
+
+
+def test_cached_gemini_response_gets_fresh_node_ids(monkeypatch):
+    node = {"node_name": "Scope Reduction", "summary": "Ship login first."}
+    models = _install_fake_gemini(monkeypatch, json.dumps([node, node]))
+
+    first = transcript_processing_module.generate_lct_json_gemini("Transcript", api_key="key")
+    second = transcript_processing_module.generate_lct_json_gemini("Transcript", api_key="key")
+
+    assert models.calls == 1
+    # Another session replaying the same segment must not reuse the node ids.
+    assert first[0]["id"] != first[1]["id"]
+    assert {n["id"] for n in first}.isdisjoint(n["id"] for n in second)
+    assert all(uuid.UUID(n["id"]).version == 4 for n in first + second)
+    assert transcript_processing_module._normalize_response_text(json.dumps([node]))[0]["id"] == ""
+
+
+def test_slugify_collapses_separators_and_keeps_unicode_letters():
+    assert transcript_processing_module._slugify("  Launch -- Timeline_v2! ") == "launch-timeline-v2"
+    assert transcript_processing_module._slugify("Café déjà vu") == "café-déjà-vu"
+    assert transcript_processing_module._slugify("!!!") == "untitled-thread"
+    assert len(transcript_processing_module._slugify("x" * 60)) == 48
+
+
+def test_get_local_http_client_is_shared(monkeypatch):
+    monkeypatch.setattr(transcript_processing_module, "_LOCAL_HTTP_CLIENT", None)
+
+    first = transcript_processing_module._get_local_http_client()
+
+    try:
+        assert transcript_processing_module._get_local_http_client() is first
+    finally:
+        first.close()
+
+
+def test_normalize_relation_type_maps_free_form_values():
+    normalize = transcript_processing_module._normalize_relation_type
+    assert normalize("Supports") == "supports"
+    assert normalize("contradicts") == "rebuts"
+    assert normalize("follow-up question") == "asks"
+    assert normalize("supporting clarification") == "supports"
+    assert normalize("branches off") == "tangent"
+    assert normalize(None) == "contextual"
+
+
+def test_retry_delay_is_jittered_and_capped():
+    delays = [transcript_processing_module._retry_delay(1.5, 10) for _ in range(50)]
+    assert all(0 <= delay <= transcript_processing_module._RETRY_CAP_SECONDS for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_as_string_list_dedupes_short_and_long_lists():
+    as_string_list = transcript_processing_module._as_string_list
+    assert as_string_list([" a ", "b", "a", None, ""]) == ["a", "b"]
+    long_value = [str(index % 5) for index in range(20)]
+    assert as_string_list(long_value) == ["0", "1", "2", "3", "4"]
+    assert as_string_list("not a list") == []
+
+
+def test_generate_lct_json_gemini_reports_invalid_json(monkeypatch):
+    _install_fake_gemini(monkeypatch, "not json")
+    monkeypatch.setattr(transcript_processing_module, "_retry_delay", lambda *args: 0)
+
+    messages = []
+    result = transcript_processing_module.generate_lct_json_gemini(
+        "Transcript", api_key="key", retries=1, status_messages=messages
+    )
+
+    assert result == []
+    assert "JSON decode failed" in messages[0]
+
+
+def test_normalize_generated_output_assigns_unique_v4_ids_to_missing_only():
+    normalized = _normalize_generated_output(
+        [
+            {"node_name": "First"},
+            {"node_name": "Second", "id": "given-id"},
+            {"node_name": "Third"},
+        ]
+    )
+
+    generated = [uuid.UUID(normalized[0]["id"]), uuid.UUID(normalized[2]["id"])]
+    assert normalized[1]["id"] == "given-id"
+    assert generated[0] != generated[1]
+    assert all(value.version == 4 for value in generated)
+
+
+def test_blank_input_skips_llm_calls(monkeypatch):
+    models = _install_fake_gemini(monkeypatch, "[]")
+    monkeypatch.setattr(
+        transcript_processing_module,
+        "generate_lct_json_local",
+        lambda *args, **kwargs: pytest.fail("local fallback should not run for blank input"),
+    )
+
+    assert transcript_processing_module.generate_lct_json("   ", llm_config={"mode": "online"}) == []
+    assert transcript_processing_module.generate_lct_json_gemini("", api_key="key") == []
+    accumulated = transcript_processing_module.genai_accumulate_text_json("  ", api_key="key")
+
+    assert models.calls == 0
+    assert accumulated["decision"] == "continue_accumulating"
+    assert accumulated["Incomplete_segment"] == "  "
+
+
+def test_min_transcript_chars_threshold_is_configurable(monkeypatch):
+    monkeypatch.setattr(transcript_processing_module, "MIN_TRANSCRIPT_CHARS", 40)
+    models = _install_fake_gemini(monkeypatch, "[]")
+
+    assert transcript_processing_module.generate_lct_json_gemini("Too short", api_key="key") == []
+    assert models.calls == 0
+
+
+def test_resolve_gemini_api_key_is_read_once_per_process(monkeypatch):
+    monkeypatch.delenv("GOOGLEAI_API_KEY", raising=False)
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.setenv("GEMINI_KEY", "first-key")
+    assert transcript_processing_module._resolve_gemini_api_key() == ("first-key", "GEMINI_KEY")
+
+    monkeypatch.setenv("GEMINI_KEY", "rotated-key")
+    assert transcript_processing_module._resolve_gemini_api_key() == ("first-key", "GEMINI_KEY")
+
+
+def test_lazy_preview_only_truncates_when_formatted(monkeypatch):
+    calls = []
+    real_preview = transcript_processing_module._preview_text
+    monkeypatch.setattr(
+        transcript_processing_module,
+        "_preview_text",
+        lambda value: calls.append(value) or real_preview(value, limit=5),
+    )
+
+    preview = transcript_processing_module._LazyPreview("abcdefghij")
+    assert calls == []
+    assert str(preview) == "abcde...<truncated 5 chars>"
+    assert calls == ["abcdefghij"]
+
+
+def test_json_object_unsupported_marker_expires(monkeypatch):
+    monkeypatch.setattr(transcript_processing_module, "_JSON_OBJECT_UNSUPPORTED_BASE_URLS", {})
+    now = [1000.0]
+    monkeypatch.setattr(transcript_processing_module.time, "monotonic", lambda: now[0])
+
+    transcript_processing_module._mark_json_object_unsupported("http://local-llm")
+    assert transcript_processing_module._json_object_unsupported("http://local-llm")
+
+    now[0] += transcript_processing_module.JSON_OBJECT_UNSUPPORTED_TTL_SECONDS
+    assert not transcript_processing_module._json_object_unsupported("http://local-llm")
+
+
+def test_local_chat_settings_are_materialized_once_per_config():
+    config = {"base_url": "http://local-llm/", "json_mode": "", "timeout_seconds": "30"}
+
+    settings = transcript_processing_module._local_chat_settings(config)
+
+    assert settings is transcript_processing_module._local_chat_settings(dict(config))
+    assert settings.chat_url == "http://local-llm/v1/chat/completions"
+    assert settings.chat_model == "glm-4.6v-flash"
+    assert settings.json_mode is False
+    assert settings.timeout_seconds == 30.0
+    unhashable = transcript_processing_module._local_chat_settings({**config, "chat_model": ["m"]})
+    assert unhashable.chat_model == ["m"]
+
+
+def test_generate_lct_json_local_reuses_cached_response(monkeypatch):
+    monkeypatch.setattr(transcript_processing_module, "_LLM_RESPONSE_CACHE", LLMCache())
+    calls = []
+
+    def _fake_call(**kwargs):
+        calls.append(kwargs["prompt"])
+        return [{"node_name": "Local Node", "summary": "From local model."}]
+
+    monkeypatch.setattr(transcript_processing_module, "_call_local_chat_json", _fake_call)
+    config = {"mode": "local", "base_url": "http://local-llm", "chat_model": "local-model"}
+
+    first = transcript_processing_module.generate_lct_json_local("Transcript", llm_config=config)
+    second = transcript_processing_module.generate_lct_json_local("Transcript", llm_config=config)
+    transcript_processing_module.generate_lct_json_local(
+        "Transcript", llm_config={**config, "chat_model": "other-model"}
+    )
+
+    assert calls == ["Transcript", "Transcript"]
+    assert first[0]["node_name"] == second[0]["node_name"] == "Local Node"
+    assert first[0]["id"] != second[0]["id"]
+
+
+def test_stream_gemini_text_stops_once_json_is_complete():
+    consumed = []
+
+    def _stream(**kwargs):
+        for piece in ('{"decision": ', '{"nested": 1}', ', "x": [1]}', "trailing"):
+            consumed.append(piece)
+            yield SimpleNamespace(text=piece)
+
+    client = SimpleNamespace(models=SimpleNamespace(generate_content_stream=_stream))
+
+    text = transcript_processing_module._stream_gemini_text(client, "model", [], None)
+
+    assert json.loads(text) == {"decision": {"nested": 1}, "x": [1]}
+    assert consumed == ['{"decision": ', '{"nested": 1}', ', "x": [1]}']
+
+
+def test_local_rate_limit_waits_out_retry_after_without_trailing_sleep(monkeypatch):
+    monkeypatch.setattr(transcript_processing_module, "_LLM_RESPONSE_CACHE", LLMCache())
+    monkeypatch.setattr(transcript_processing_module, "_RATE_LIMIT_COOLDOWNS", {})
+    sleeps = []
+    monkeypatch.setattr(transcript_processing_module.time, "sleep", sleeps.append)
+    request = httpx.Request("POST", "http://local-llm/v1/chat/completions")
+    rate_limited = httpx.Response(429, headers={"retry-after": "2"}, request=request)
+
+    def _fake_call(**kwargs):
+        raise httpx.HTTPStatusError("rate limited", request=request, response=rate_limited)
+
+    monkeypatch.setattr(transcript_processing_module, "_call_local_chat_json", _fake_call)
+    config = {"mode": "local", "base_url": "http://local-llm", "chat_model": "local-model"}
+
+    result = transcript_processing_module.accumulate_text_json_local("hello", llm_config=config, retries=2)
+
+    assert result["decision"] == "continue_accumulating"
+    # One cooldown wait before the second attempt, no backoff after the last one.
+    assert len(sleeps) == 1
+    assert 0 < sleeps[0] <= 2
+    assert "http://local-llm" in transcript_processing_module._RATE_LIMIT_COOLDOWNS
+
+
+def test_local_accumulate_does_not_retry_client_errors(monkeypatch):
+    monkeypatch.setattr(transcript_processing_module, "_LLM_RESPONSE_CACHE", LLMCache())
+    monkeypatch.setattr(transcript_processing_module, "_RATE_LIMIT_COOLDOWNS", {})
+    sleeps = []
+    monkeypatch.setattr(transcript_processing_module.time, "sleep", sleeps.append)
+    request = httpx.Request("POST", "http://local-llm/v1/chat/completions")
+    unauthorized = httpx.Response(401, request=request)
+    calls = []
+
+    def _fake_call(**kwargs):
+        calls.append(kwargs)
+        raise httpx.HTTPStatusError("unauthorized", request=request, response=unauthorized)
+
+    monkeypatch.setattr(transcript_processing_module, "_call_local_chat_json", _fake_call)
+    config = {"mode": "local", "base_url": "http://local-llm", "chat_model": "local-model"}
+
+    result = transcript_processing_module.accumulate_text_json_local("hello", llm_config=config, retries=3)
+
+    assert result["decision"] == "continue_accumulating"
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_processor_runs_llm_calls_off_the_event_loop_thread(monkeypatch):
+    main_thread = threading.get_ident()
+    call_threads = []
+
+    def _fake_accumulate(input_text, llm_config=None):
+        call_threads.append(threading.get_ident())
+        return {"decision": "stop_accumulating", "Completed_segment": input_text, "Incomplete_segment": ""}
+
+    def _fake_generate(transcript, llm_config=None, status_messages=None):
+        call_threads.append(threading.get_ident())
+        return [{"node_name": "Node"}]
+
+    monkeypatch.setattr(transcript_processing_module, "accumulate_text_json", _fake_accumulate)
+    monkeypatch.setattr(transcript_processing_module, "generate_lct_json", _fake_generate)
+    updates = []
+
+    async def _send_update(existing_json, chunk_dict):
+        updates.append(list(existing_json))
+
+    processor = transcript_processing_module.TranscriptProcessor(
+        _send_update, llm_config={"mode": "local"}
+    )
+    await processor._process_batch(["hello"])
+    await processor.flush()
+
+    assert len(call_threads) == 2
+    assert main_thread not in call_threads
+    assert updates[0][0]["node_name"] == "Node"
+
+
+def test_gemini_client_is_reused_per_api_key(monkeypatch):
+    created = []
+
+    def _client(api_key):
+        created.append(api_key)
+        return SimpleNamespace(api_key=api_key)
+
+    genai, types = transcript_processing_module._ensure_genai()
+    monkeypatch.setattr(
+        transcript_processing_module,
+        "_ensure_genai",
+        lambda: (SimpleNamespace(Client=_client, types=genai.types), types),
+    )
+    monkeypatch.setattr(transcript_processing_module, "_GEMINI_CLIENTS", {})
+
+    first = transcript_processing_module._get_gemini_client("key-a")
+    assert transcript_processing_module._get_gemini_client("key-a") is first
+    transcript_processing_module._get_gemini_client("key-b")
+
+    assert created == ["key-a", "key-b"]
+
+
+def test_processor_existing_json_prompt_text_is_compact_and_incremental():
+    async def _send_update(existing_json, chunk_dict):
+        return None
+
+    processor = transcript_processing_module.TranscriptProcessor(_send_update, llm_config={"mode": "local"})
+    assert processor._existing_json_prompt_text() == "[]"
+
+    processor.existing_json.append({"id": "a", "node_name": "First"})
+    assert processor._existing_json_prompt_text() == '[{"id":"a","node_name":"First"}]'
+
+    processor.existing_json.extend([{"id": "b"}, {"id": "c"}])
+    text = processor._existing_json_prompt_text()
+    assert text == '[{"id":"a","node_name":"First"},{"id":"b"},{"id":"c"}]'
+    assert json.loads(text) == processor.existing_json
+
+    processor.existing_json = [{"id": "z"}]
+    assert processor._existing_json_prompt_text() == '[{"id":"z"}]'
+
+
+@pytest.mark.parametrize("cache_prompt", [True, False])
+def test_call_local_chat_json_sends_cache_prompt_when_enabled(monkeypatch, cache_prompt):
+    payloads = []
+
+    def _post(url, content, headers, timeout):
+        assert headers["Content-Type"] == "application/json"
+        payloads.append(json.loads(content))
+        request = httpx.Request("POST", url)
+        body = {"choices": [{"message": {"content": '{"ok": true}'}}]}
+        return httpx.Response(200, json=body, request=request)
+
+    monkeypatch.setattr(
+        transcript_processing_module, "_get_local_http_client", lambda: SimpleNamespace(post=_post)
+    )
+    config = {"base_url": "http://local-llm", "json_mode": False, "cache_prompt": cache_prompt}
+
+    result = transcript_processing_module._call_local_chat_json(
+        prompt="hello", system_prompt="system", config=config, temperature=0.1, max_tokens=10
+    )
+
+    assert result == {"ok": True}
+    assert payloads[0].get("cache_prompt", False) is cache_prompt
+
+
+@pytest.mark.asyncio
+async def test_processor_reuses_joined_accumulator_text(monkeypatch):
+    inputs = []
+
+    def _fake_accumulate(input_text, llm_config=None):
+        inputs.append(input_text)
+        return {"decision": "continue_accumulating", "Completed_segment": "", "Incomplete_segment": ""}
+
+    monkeypatch.setattr(transcript_processing_module, "accumulate_text_json", _fake_accumulate)
+    monkeypatch.setattr(transcript_processing_module, "generate_lct_json", lambda *args, **kwargs: [])
+
+    async def _send_update(existing_json, chunk_dict):
+        return None
+
+    processor = transcript_processing_module.TranscriptProcessor(
+        _send_update, batch_size=2, max_batch_size=2, llm_config={"mode": "local"}, debounce_seconds=0
+    )
+    await processor.handle_final_text("one")
+    await processor.handle_final_text("two")
+
+    # Growth cap reached: the same accumulator is force-flushed without asking again.
+    assert inputs == ["one two"]
+    assert processor.accumulator == []
+    assert processor._accumulator_text() == ""
+
+    await processor.handle_final_text("three")
+    assert processor._accumulator_text() == "three"
+
+
+def test_stream_gemini_text_trims_trailing_chatter_after_document():
+    consumed = []
+
+    def _stream(**kwargs):
+        pieces = ('Note [1]: {"text": "a } \\" ]", ', '"x": [1, {"y": 2}]} and then', " more chatter", "unused")
+        for piece in pieces:
+            consumed.append(piece)
+            yield SimpleNamespace(text=piece)
+
+    client = SimpleNamespace(models=SimpleNamespace(generate_content_stream=_stream))
+
+    text = transcript_processing_module._stream_gemini_text(client, "model", [], None)
+
+    # Leading prose never parses, so the whole stream is read and returned as-is.
+    assert consumed[-1] == "unused"
+    assert text.startswith("Note [1]")
+
+    consumed.clear()
+
+    def _clean_stream(**kwargs):
+        for piece in ('{"text": "a } \\" ]", ', '"x": [1, {"y": 2}]} trailing', "unused"):
+            consumed.append(piece)
+            yield SimpleNamespace(text=piece)
+
+    client = SimpleNamespace(models=SimpleNamespace(generate_content_stream=_clean_stream))
+
+    text = transcript_processing_module._stream_gemini_text(client, "model", [], None)
+
+    assert json.loads(text) == {"text": 'a } " ]', "x": [1, {"y": 2}]}
+    assert "unused" not in consumed
+
+
+@pytest.mark.asyncio
+async def test_processor_grows_batches_multiplicatively_and_starts_larger_when_llm_is_slow(monkeypatch):
+    decisions = []
+
+    def _fake_accumulate(input_text, llm_config=None):
+        decision = decisions.pop(0)
+        return {"decision": decision, "Completed_segment": "", "Incomplete_segment": ""}
+
+    monkeypatch.setattr(transcript_processing_module, "accumulate_text_json", _fake_accumulate)
+
+    async def _send_update(existing_json, chunk_dict):
+        return None
+
+    processor = transcript_processing_module.TranscriptProcessor(
+        _send_update, batch_size=2, max_batch_size=10, llm_config={"mode": "local"}, debounce_seconds=0
+    )
+
+    decisions.extend(["continue_accumulating", "continue_accumulating"])
+    for text in ("a", "b", "c", "d"):
+        await processor.handle_final_text(text)
+    # 2 -> int(2 * 1.5) + 1 = 4 -> int(4 * 1.5) + 1 = 7
+    assert processor._current_batch_size == 7
+
+    processor._accumulate_latency_ewma = 5.0
+    decisions.append("stop_accumulating")
+    for text in ("e", "f", "g"):
+        await processor.handle_final_text(text)
+    # Slow accumulation calls: the next run starts one growth step above base.
+    assert processor._current_batch_size == 4
+
+
+@pytest.mark.asyncio
+async def test_processor_reports_non_blank_accumulate_errors_as_one_status(monkeypatch):
+    def _fake_accumulate(input_text, llm_config=None):
+        return {
+            "decision": "continue_accumulating",
+            "Completed_segment": "",
+            "Incomplete_segment": "",
+            "_errors": ["first", "  ", 3],
+        }
+
+    monkeypatch.setattr(transcript_processing_module, "accumulate_text_json", _fake_accumulate)
+    statuses = []
+
+    async def _send_update(existing_json, chunk_dict):
+        return None
+
+    async def _send_status(level, message, context):
+        statuses.append((level, message, context))
+
+    processor = transcript_processing_module.TranscriptProcessor(
+        _send_update, send_status=_send_status, llm_config={"mode": "local"}
+    )
+    await processor._process_batch(["hello"])
+
+    assert statuses == [
+        ("warning", "first (+1 more)", {"stage": "accumulate", "attempt_errors": ["first", "3"]})
+    ]
+
+
+@pytest.mark.asyncio
+async def test_processor_skips_accumulate_call_for_unchanged_input(monkeypatch):
+    inputs = []
+
+    def _fake_accumulate(input_text, llm_config=None):
+        inputs.append(input_text)
+        return {"decision": "continue_accumulating", "Completed_segment": "", "Incomplete_segment": ""}
+
+    monkeypatch.setattr(transcript_processing_module, "accumulate_text_json", _fake_accumulate)
+
+    async def _send_update(existing_json, chunk_dict):
+        return None
+
+    processor = transcript_processing_module.TranscriptProcessor(_send_update, llm_config={"mode": "local"})
+
+    assert await processor._process_batch(["same"]) == (True, "")
+    assert await processor._process_batch(["same"]) == (True, "")
+    await processor._process_batch(["same", "more"])
+
+    assert inputs == ["same", "same more"]
+
+
+def test_extend_json_array_text_splices_compact_items():
+    extend = transcript_processing_module.extend_json_array_text
+
+    text = extend("[]", [{"id": "a"}])
+    assert text == '[{"id":"a"}]'
+    assert extend(text, []) is text
+    text = extend(text, [{"id": "b"}, 1])
+    assert json.loads(text) == [{"id": "a"}, {"id": "b"}, 1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("completed", ["one two", "one"])
+async def test_processor_speculative_generate_keeps_matching_guess(monkeypatch, completed):
+    generated = []
+
+    def _fake_accumulate(input_text, llm_config=None):
+        return {"decision": "stop_accumulating", "Completed_segment": completed, "Incomplete_segment": ""}
+
+    def _fake_generate(transcript, llm_config=None, status_messages=None):
+        segment = transcript.rsplit("Transcript Input: \n ", 1)[1]
+        generated.append(segment)
+        return [{"node_name": segment}]
+
+    monkeypatch.setattr(transcript_processing_module, "accumulate_text_json", _fake_accumulate)
+    monkeypatch.setattr(transcript_processing_module, "generate_lct_json", _fake_generate)
+
+    async def _send_update(existing_json, chunk_dict):
+        return None
+
+    processor = transcript_processing_module.TranscriptProcessor(
+        _send_update, llm_config={"mode": "local"}, enable_speculative_generate=True
+    )
+    await processor._process_batch(["one", "two"])
+    await processor.flush()
+
+    if completed == "one two":
+        # The guess matched: no second generation call.
+        assert generated == ["one two"]
+    else:
+        # The cancelled guess may or may not have reached the model; its output is discarded.
+        assert "one" in generated
+    assert [node["node_name"] for node in processor.existing_json] == [completed]
+
+
+def test_processor_prompt_text_summarizes_nodes_outside_full_window(monkeypatch):
+    monkeypatch.setattr(transcript_processing_module, "PROMPT_FULL_NODE_COUNT", 2)
+    monkeypatch.setattr(transcript_processing_module, "PROMPT_NODE_SUMMARY_CHARS", 5)
+
+    async def _send_update(existing_json, chunk_dict):
+        return None
+
+    processor = transcript_processing_module.TranscriptProcessor(_send_update, llm_config={"mode": "local"})
+    nodes = [
+        {"node_name": f"N{index}", "summary": "long summary", "is_bookmark": index == 0, "claims": ["c"]}
+        for index in range(4)
+    ]
+    processor.existing_json.extend(nodes[:3])
+    first = json.loads(processor._existing_json_prompt_text())
+    processor.existing_json.append(nodes[3])
+    second = json.loads(processor._existing_json_prompt_text())
+
+    def _summary(name, is_bookmark=False):
+        return {
+            "node_name": name,
+            "summary": "long...",
+            "predecessor": None,
+            "successor": None,
+            "is_bookmark": is_bookmark,
+        }
+
+    assert first == [_summary("N0", True), nodes[1], nodes[2]]
+    assert second[:2] == [_summary("N0", True), _summary("N1")]
+    assert second[2:] == nodes[2:]
+
+    monkeypatch.setattr(transcript_processing_module, "PROMPT_SUMMARY_NODE_LIMIT", 1)
+    capped = json.loads(processor._existing_json_prompt_text())
+    assert capped == [_summary("N1")] + nodes[2:]
+
+
+@pytest.mark.asyncio
+async def test_processor_debounces_rapid_finals_into_one_batch(monkeypatch):
+    inputs = []
+
+    def _fake_accumulate(input_text, llm_config=None):
+        inputs.append(input_text)
+        return {"decision": "stop_accumulating", "Completed_segment": "", "Incomplete_segment": ""}
+
+    monkeypatch.setattr(transcript_processing_module, "accumulate_text_json", _fake_accumulate)
+
+    async def _send_update(existing_json, chunk_dict):
+        return None
+
+    processor = transcript_processing_module.TranscriptProcessor(
+        _send_update, batch_size=2, llm_config={"mode": "local"}, debounce_seconds=0.05
+    )
+    for text in ("a", "b", "c"):
+        await processor.handle_final_text(text)
+    assert inputs == []
+
+    await processor.flush()
+
+    # The due batch waited for "c"; flush then had nothing left to send.
+    assert inputs == ["a b c"]
+    assert processor.accumulator == []
+
+
+@pytest.mark.asyncio
+async def test_processor_keeps_finals_that_arrive_during_a_batch(monkeypatch):
+    processor = None
+
+    def _fake_accumulate(input_text, llm_config=None):
+        processor.accumulator.append("late")
+        return {"decision": "stop_accumulating", "Completed_segment": "", "Incomplete_segment": "rest"}
+
+    monkeypatch.setattr(transcript_processing_module, "accumulate_text_json", _fake_accumulate)
+
+    async def _send_update(existing_json, chunk_dict):
+        return None
+
+    processor = transcript_processing_module.TranscriptProcessor(
+        _send_update, batch_size=1, llm_config={"mode": "local"}, debounce_seconds=0
+    )
+    await processor.handle_final_text("first")
+
+    assert processor.accumulator == ["rest", "late"]
+
+
+@pytest.mark.asyncio
+async def test_processor_caps_batches_when_finals_pile_up(monkeypatch):
+    batch_sizes = []
+
+    def _fake_accumulate(input_text, llm_config=None):
+        batch_sizes.append(len(input_text.split()))
+        return {"decision": "stop_accumulating", "Completed_segment": "", "Incomplete_segment": ""}
+
+    monkeypatch.setattr(transcript_processing_module, "accumulate_text_json", _fake_accumulate)
+
+    async def _send_update(existing_json, chunk_dict):
+        return None
+
+    processor = transcript_processing_module.TranscriptProcessor(
+        _send_update, batch_size=2, max_batch_size=3, llm_config={"mode": "local"}, debounce_seconds=0.05
+    )
+    for index in range(10):
+        await processor.handle_final_text(f"t{index}")
+
+    await processor.flush()
+
+    assert sum(batch_sizes) == 10
+    assert max(batch_sizes) <= 3
+    assert processor.accumulator == []
+
+
+@pytest.mark.asyncio
+async def test_processor_aclose_cancels_pending_batch(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        transcript_processing_module,
+        "accumulate_text_json",
+        lambda input_text, llm_config=None: calls.append(input_text),
+    )
+
+    async def _send_update(existing_json, chunk_dict):
+        return None
+
+    processor = transcript_processing_module.TranscriptProcessor(
+        _send_update, batch_size=1, llm_config={"mode": "local"}, debounce_seconds=30
+    )
+    await processor.handle_final_text("first")
+    batch_task = processor._batch_task
+
+    await processor.aclose()
+
+    assert batch_task.cancelled()
+    assert processor._batch_task is None
+    assert calls == []
+
+
+def test_processor_chunk_ids_are_unique_v4_uuids():
+    async def _send_update(existing_json, chunk_dict):
+        return None
+
+    processor = transcript_processing_module.TranscriptProcessor(_send_update, llm_config={"mode": "local"})
+    other = transcript_processing_module.TranscriptProcessor(_send_update, llm_config={"mode": "local"})
+
+    ids = [processor._next_chunk_id() for _ in range(1000)] + [other._next_chunk_id()]
+
+    assert len(set(ids)) == len(ids)
+    assert all(uuid.UUID(chunk_id).version == 4 for chunk_id in ids)
+
+
+def test_gemini_context_cache_is_created_once_and_replaced_after_failure(monkeypatch):
+    monkeypatch.setattr(transcript_processing_module, "GEMINI_CONTEXT_CACHE_ENABLED", True)
+    monkeypatch.setattr(transcript_processing_module, "_GEMINI_PROMPT_CACHES", {})
+    monkeypatch.setattr(transcript_processing_module, "_LLM_RESPONSE_CACHE", LLMCache())
+    monkeypatch.setattr(transcript_processing_module, "_retry_delay", lambda *args: 0)
+    created = []
+    configs = []
+
+    def _create(model, config):
+        created.append(model)
+        return SimpleNamespace(name=f"cachedContents/{len(created)}")
+
+    def _stream(model, contents, config):
+        configs.append(config)
+        if len(configs) == 1:
+            raise RuntimeError("404 cached content not found")
+        yield SimpleNamespace(text='[{"node_name": "Node", "summary": "S"}]')
+
+    client = SimpleNamespace(
+        caches=SimpleNamespace(create=_create),
+        models=SimpleNamespace(generate_content_stream=_stream),
+    )
+    monkeypatch.setattr(transcript_processing_module, "_get_gemini_client", lambda api_key: client)
+
+    result = transcript_processing_module.generate_lct_json_gemini("Transcript", api_key="key", retries=2)
+
+    assert result[0]["node_name"] == "Node"
+    assert [config.cached_content for config in configs] == ["cachedContents/1", "cachedContents/2"]
+    assert configs[0].system_instruction is None
+
+    transcript_processing_module.generate_lct_json_gemini("Other transcript", api_key="key")
+    assert len(created) == 2
+
+
+def test_gemini_context_cache_is_kept_after_unrelated_failure(monkeypatch):
+    monkeypatch.setattr(transcript_processing_module, "GEMINI_CONTEXT_CACHE_ENABLED", True)
+    monkeypatch.setattr(transcript_processing_module, "_GEMINI_PROMPT_CACHES", {})
+    monkeypatch.setattr(transcript_processing_module, "_LLM_RESPONSE_CACHE", LLMCache())
+    monkeypatch.setattr(transcript_processing_module, "_retry_delay", lambda *args: 0)
+    created = []
+    configs = []
+
+    def _create(model, config):
+        created.append(model)
+        return SimpleNamespace(name=f"cachedContents/{len(created)}")
+
+    def _stream(model, contents, config):
+        configs.append(config)
+        if len(configs) == 1:
+            raise RuntimeError("503 model overloaded")
+        yield SimpleNamespace(text='[{"node_name": "Node", "summary": "S"}]')
+
+    client = SimpleNamespace(
+        caches=SimpleNamespace(create=_create),
+        models=SimpleNamespace(generate_content_stream=_stream),
+    )
+    monkeypatch.setattr(transcript_processing_module, "_get_gemini_client", lambda api_key: client)
+
+    result = transcript_processing_module.generate_lct_json_gemini("Transcript", api_key="key", retries=2)
+
+    assert result[0]["node_name"] == "Node"
+    assert configs[1] is configs[0]
+    assert len(created) == 1
+
+
+def test_gemini_context_cache_falls_back_to_inline_prompt(monkeypatch):
+    monkeypatch.setattr(transcript_processing_module, "GEMINI_CONTEXT_CACHE_ENABLED", True)
+    monkeypatch.setattr(transcript_processing_module, "_GEMINI_PROMPT_CACHES", {})
+    attempts = []
+
+    def _create(model, config):
+        attempts.append(model)
+        raise RuntimeError("400 cached content is too small")
+
+    client = SimpleNamespace(caches=SimpleNamespace(create=_create))
+
+    configs = [
+        transcript_processing_module._gemini_generate_config(client, "key", "gemini-2.5-flash", "short prompt")
+        for _ in range(2)
+    ]
+
+    assert configs[0].cached_content is None
+    assert configs[0].system_instruction
+    # The inline config is built once and shared.
+    assert configs[1] is configs[0]
+    assert len(attempts) == 1
+
+
+@pytest.mark.asyncio
+async def test_processor_next_accumulate_overlaps_pending_generation(monkeypatch):
+    generate_started = threading.Event()
+    release_generate = threading.Event()
+    accumulate_inputs = []
+
+    def _fake_accumulate(input_text, llm_config=None):
+        accumulate_inputs.append(input_text)
+        return {"decision": "stop_accumulating", "Completed_segment": input_text, "Incomplete_segment": ""}
+
+    def _fake_generate(transcript, llm_config=None, status_messages=None):
+        generate_started.set()
+        release_generate.wait(timeout=5)
+        segment = transcript.rsplit("Transcript Input: \n ", 1)[1]
+        return [{"node_name": segment}]
+
+    monkeypatch.setattr(transcript_processing_module, "accumulate_text_json", _fake_accumulate)
+    monkeypatch.setattr(transcript_processing_module, "generate_lct_json", _fake_generate)
+
+    updates = []
+
+    async def _send_update(existing_json, chunk_dict):
+        updates.append([node["node_name"] for node in existing_json])
+
+    processor = transcript_processing_module.TranscriptProcessor(
+        _send_update, llm_config={"mode": "local"}, debounce_seconds=0
+    )
+    await processor._process_batch(["first"])
+    await asyncio.to_thread(generate_started.wait, 5)
+    # The first graph is still generating while the next batch is accumulated.
+    await processor._process_batch(["second"])
+    assert accumulate_inputs == ["first", "second"]
+    assert updates == []
+
+    release_generate.set()
+    await processor.flush()
+
+    # Generations apply in the order their segments completed.
+    assert updates == [["first"], ["first", "second"]]
+
+
+@pytest.mark.asyncio
+async def test_processor_skips_accumulate_for_short_batches(monkeypatch):
+    monkeypatch.setattr(transcript_processing_module, "MIN_ACCUMULATE_CHARS", 10)
+    inputs = []
+
+    def _fake_accumulate(input_text, llm_config=None):
+        inputs.append(input_text)
+        return {"decision": "continue_accumulating", "Completed_segment": "", "Incomplete_segment": input_text}
+
+    def _fake_generate(transcript, llm_config=None, status_messages=None):
+        return [{"node_name": "Node"}]
+
+    monkeypatch.setattr(transcript_processing_module, "accumulate_text_json", _fake_accumulate)
+    monkeypatch.setattr(transcript_processing_module, "generate_lct_json", _fake_generate)
+
+    async def _send_update(existing_json, chunk_dict):
+        return None
+
+    processor = transcript_processing_module.TranscriptProcessor(_send_update, llm_config={"mode": "local"})
+
+    assert await processor._process_batch(["short"]) == (True, "short")
+    await processor._process_batch(["long enough text"])
+    assert inputs == ["long enough text"]
+
+    # A forced flush always reaches the LLM.
+    await processor._process_batch(["short"], stop_accumulating_flag=True)
+    await processor.flush()
+    assert inputs == ["long enough text", "short"]
+    assert [node["node_name"] for node in processor.existing_json] == ["Node"]
@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+from lct_python_backend.services.turn_synthesizer import _create_node_label, build_turn_graph_from_utterances
+
+
+def test_create_node_label_uses_first_sentence():
+    assert _create_node_label("Ada Lovelace", "Short one? Then more. Rest") == "[AL] Short one?"
+    assert _create_node_label("bob", "Line one!\nLine two.") == "[BO] Line one!"
+    # Punctuation without trailing whitespace doesn't end a sentence.
+    assert _create_node_label("Ada Lovelace", "v1.2 ships today") == "[AL] v1.2 ships today"
+
+
+def test_create_node_label_truncates_long_first_sentence():
+    label = _create_node_label("Ada Lovelace", "word " * 30)
+
+    assert label.startswith("[AL] word word")
+    assert label.endswith("...")
+    assert len(label) <= len("[AL] ") + 60 + len("...")
+
+
+def test_build_turn_graph_groups_consecutive_speakers():
+    utterances = [
+        SimpleNamespace(
+            id=index,
+            speaker_id=speaker,
+            text=f"Line {index}.",
+            sequence_number=index,
+            timestamp_start=float(index),
+            timestamp_end=float(index) + 0.5,
+        )
+        for index, speaker in enumerate(["A", "A", "B", "A"])
+    ]
+
+    nodes = build_turn_graph_from_utterances(utterances)
+
+    assert [node["id"] for node in nodes] == ["turn_1", "turn_2", "turn_3"]
+    assert nodes[0]["full_text"] == "Line 0.\nLine 1."
+    assert nodes[0]["node_name"] == "[A] Line 0."
+    assert [node["successor"] for node in nodes] == ["turn_2", "turn_3", None]
+    assert [node["predecessor"] for node in nodes] == [None, "turn_1", "turn_2"]
+
+
+def test_build_turn_graph_handles_no_utterances():
+    assert build_turn_graph_from_utterances([]) == []
@@ -323,8 +323,8 @@ async def get_thematic_structure(
     """
     try:
         from lct_python_backend.services.thematic_analyzer import ThematicAnalyzer
-        from lct_python_backend.models import Node, Relationship, Utterance
-        from sqlalchemy import select, and_
+        from lct_python_backend.models import Utterance
+        from sqlalchemy import select
 
         conv_uuid = uuid.UUID(conversation_id)
 
@@ -374,16 +374,9 @@ async def get_thematic_structure(
                 }
             }
 
-        # Fetch nodes for requested level (1-5)
-        result = await db.execute(
-            select(Node).where(
-                and_(
-                    Node.conversation_id == conv_uuid,
-                    Node.level == level
-                )
-            )
-        )
-        nodes = result.scalars().all()
+        # Fetch nodes (and their edges) for requested level (1-5)
+        analyzer = ThematicAnalyzer(db)
+        nodes, relationships = await analyzer._fetch_existing_structure(conversation_id, level=level)
 
         if not nodes:
             return {
@@ -397,8 +390,7 @@ async def get_thematic_structure(
             }
 
         # Serialize existing structure
-        analyzer = ThematicAnalyzer(db)
-        structure = await analyzer._serialize_existing_structure(nodes, conversation_id)
+        structure = analyzer._serialize_existing_structure(nodes, relationships)
         structure["summary"]["exists"] = True
         structure["summary"]["level"] = level
 